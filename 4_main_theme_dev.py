@@ -1,11 +1,36 @@
+import time
+# 启动计时起点（--startup-trace）
+startup_time = time.perf_counter()
 import os
+import re
 import sys
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, filedialog
+import stat
+import tempfile
+import io
+import math
+from collections import OrderedDict, deque
+from array import array
+import functools
+import bisect
+import hashlib
+import marshal
+import codecs
+from tkinter import messagebox
 from pathlib import Path
 import configparser
-import subprocess
 import logging
+import logging.handlers
+import gzip
+import shutil
+import datetime
+import json
+import shlex
+import threading
+import queue
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from abc import ABC, abstractmethod
 import ttkbootstrap as ttkb
 
 window_title = "渗透测试工具箱 v0.1.0（内测版）"
@@ -22,28 +47,322 @@ about_text = """
         
         作者: AiENG07
         """
-# 设置日志
-log_file = "log/app.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# 日志文件（与程序同目录，不受启动时工作目录影响），由 setup_logging() 配置
+log_file = Path(sys.argv[0]).parent.resolve() / 'log' / 'app.log'
+# 日志文件超过该大小或跨天时轮转，归档压缩后最多保留 log_backup_count 个
+log_max_bytes = 5 * 1024 * 1024
+log_backup_count = 10
+# 工具启动记录（JSON Lines）
+launch_log_file = log_file.parent / 'launches.jsonl'
+
+# 非工具配置节
+reserved_sections = ('set', 'environments')
+# 配置快照格式版本
+snapshot_version = 1
+# 默认主题
+default_theme = 'vapor'
+# 工具目录加载完成后才可用的菜单
+catalog_menus = ("编辑", "设置", "主题")
+
+
+class Tool:
+    """工具记录（紧凑的只读结构）"""
+    __slots__ = ('name', 'category', 'path', 'type', 'env', 'args', 'description')
+
+    def __init__(self, name, category='', path='', tool_type='', env='', args='', description=''):
+        self.name = name
+        self.category = sys.intern(category)
+        self.path = path
+        self.type = sys.intern(tool_type)
+        self.env = sys.intern(env)
+        self.args = args
+        self.description = description
+
+    @classmethod
+    def from_section(cls, name, section):
+        """从配置节创建工具记录"""
+        return cls(
+            name,
+            section.get('category', ''),
+            section.get('path', ''),
+            section.get('type', ''),
+            section.get('env', ''),
+            section.get('args', ''),
+            section.get('description', '')
+        )
+
+    def __repr__(self):
+        return f"Tool({self.name!r}, category={self.category!r}, type={self.type!r})"
+
+
+class _LazyProxies(dict):
+    """按需创建 SectionProxy 的字典"""
+    def __init__(self, parser):
+        super().__init__()
+        self.parser = parser
+
+    def __missing__(self, key):
+        proxy = configparser.SectionProxy(self.parser, key)
+        self[key] = proxy
+        return proxy
+
+    def __delitem__(self, key):
+        self.pop(key, None)
+
+
+def _parser_internals_supported():
+    """ConfigParser 的内部结构是否与 CatalogParser 的假设一致（_sections / _proxies 两个字典）"""
+    try:
+        probe = configparser.ConfigParser()
+        probe.read_string("[a]\nb = c\n")
+        return (probe._sections == {'a': {'b': 'c'}}
+                and isinstance(probe._proxies, dict)
+                and isinstance(probe._proxies.get('a'), configparser.SectionProxy))
+    except (AttributeError, TypeError):
+        return False
+
+
+class CatalogParser(configparser.ConfigParser):
+    """支持从快照直接载入配置节的 ConfigParser
+
+    直接读写 ConfigParser 内部的 _sections / _proxies。导入时检查内部结构，
+    不一致时（fast 为 False）只使用公开接口：不读写快照，raw_sections 返回副本。
+    """
+    fast = _parser_internals_supported()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.fast:
+            proxies = _LazyProxies(self)
+            proxies.update(self._proxies)
+            self._proxies = proxies
+
+    def load_sections(self, sections):
+        """载入已解析的配置节 {名称: {键: 原始值}}，跳过 INI 解析"""
+        if self.fast:
+            self._sections = sections
+        else:
+            self.read_dict(sections)
+
+    def raw_sections(self):
+        """获取所有配置节的原始值（只读）"""
+        if self.fast:
+            return self._sections
+        return {section: dict(self.items(section, raw=True)) for section in self.sections()}
+
+
+class IniDocument:
+    """按配置节增量写入的 INI 文件
+
+    记录每个配置节在文件中的位置，保存时只替换被修改的配置节，
+    其余内容（包括注释）原样保留，并通过临时文件 + 重命名原子写入。
+    """
+    # 只匹配顶格的节名：缩进的行是上一个值的续行（与 configparser 一致）
+    section_re = re.compile(r'^\[(?P<header>.+)\][ \t]*$', re.MULTILINE)
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.text = ''
+        self.signature = None
+        self.digest = None
+        # 文件使用的换行符；内部统一为 \n，写回时还原
+        self.newline = '\n'
+        self.dirty = set()
+        self._spans = None
+
+    def _stat_signature(self):
+        """文件签名（修改时间和大小）"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self):
+        """读取文件内容"""
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        self.signature = self._stat_signature()
+        self.digest = hashlib.sha1(raw).hexdigest()
+        self.text = raw.decode('utf-8')
+        crlf = raw.count(b'\r\n')
+        self.newline = '\r\n' if crlf and crlf * 2 >= raw.count(b'\n') else '\n'
+        if crlf:
+            self.text = self.text.replace('\r\n', '\n')
+        self._spans = None
+        return self.text
+
+    def mark(self, section):
+        """标记配置节已修改"""
+        self.dirty.add(section)
+
+    def spans(self):
+        """获取每个配置节的位置 {名称: (起始, 结束)}"""
+        if self._spans is None:
+            spans = {}
+            matches = list(self.section_re.finditer(self.text))
+            for i, match in enumerate(matches):
+                end = matches[i + 1].start() if i + 1 < len(matches) else len(self.text)
+                spans.setdefault(match.group('header'), (match.start(), end))
+            self._spans = spans
+        return self._spans
+
+    @staticmethod
+    def format_section(parser, section):
+        """按 configparser 的格式序列化单个配置节"""
+        lines = [f"[{section}]\n"]
+        for key, value in parser.items(section, raw=True):
+            if value is None:
+                lines.append(f"{key}\n")
+            else:
+                value = str(value).replace('\n', '\n\t')
+                lines.append(f"{key} = {value}\n")
+        lines.append("\n")
+        return ''.join(lines)
+
+    @staticmethod
+    def _trailing_comments(chunk):
+        """配置节末尾属于下一节的注释和空行"""
+        lines = chunk.splitlines(keepends=True)
+        i = len(lines)
+        while i > 1 and (not lines[i - 1].strip() or lines[i - 1].lstrip()[:1] in ('#', ';')):
+            i -= 1
+        tail = ''.join(lines[i:])
+        # 空行由 format_section 负责，只保留注释部分
+        return tail.lstrip('\r\n') if tail.strip() else ''
+
+    def save(self, parser):
+        """将修改过的配置节写回文件"""
+        if not self.dirty:
+            return
+        merged = False
+        if self.signature is None or self._stat_signature() != self.signature:
+            # 文件被外部修改，基于最新内容打补丁
+            if self.path.exists():
+                self.load()
+                merged = True
+            else:
+                self.text, self._spans = '', None
+                self.dirty.update(parser.sections())
+
+        spans = self.spans()
+        pieces = []
+        pos = 0
+        for section, (start, end) in sorted(spans.items(), key=lambda item: item[1]):
+            if section not in self.dirty:
+                continue
+            pieces.append(self.text[pos:start])
+            if parser.has_section(section):
+                pieces.append(self.format_section(parser, section))
+            pieces.append(self._trailing_comments(self.text[start:end]))
+            pos = end
+        pieces.append(self.text[pos:])
+
+        for section in parser.sections():
+            if section in self.dirty and section not in spans:
+                if pieces[-1] and not pieces[-1].endswith('\n\n'):
+                    pieces.append('\n' if pieces[-1].endswith('\n') else '\n\n')
+                pieces.append(self.format_section(parser, section))
+
+        self._atomic_write(''.join(pieces))
+        self.dirty.clear()
+        if merged:
+            # 写入的文件包含外部修改，但内存中的配置还没有：清空签名，
+            # 让 ConfigWatcher 重新加载合并后的文件，快照也不会以它为键
+            self.signature = self.digest = None
+
+    def _atomic_write(self, text):
+        """通过临时文件 + 重命名原子写入（按原文件的换行符写出）"""
+        data = (text if self.newline == '\n' else text.replace('\n', self.newline)).encode('utf-8')
+        fd, tmp_path = tempfile.mkstemp(prefix=self.path.name + '.', suffix='.tmp', dir=self.path.parent)
+        try:
+            try:
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(self.path).st_mode))
+            except FileNotFoundError:
+                pass
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.text = text
+        self._spans = None
+        self.signature = self._stat_signature()
+        self.digest = hashlib.sha1(data).hexdigest()
+
+
+class CategoryPack:
+    """conf.d 目录中单个分类的工具文件"""
+    __slots__ = ('category', 'document', 'count', 'config')
+
+    def __init__(self, category, path):
+        self.category = sys.intern(category)
+        self.document = IniDocument(path)
+        self.count = 0
+        self.config = None
+
+    @property
+    def loaded(self):
+        return self.config is not None
+
 
 class ConfigManager:
     """管理配置文件的类"""
     def __init__(self, config_path):
         self.config_path = config_path
         self.current_dir = Path(sys.argv[0]).parent.resolve()
-        self.config = configparser.ConfigParser()
+        self.config = CatalogParser()
+        self.document = IniDocument(config_path)
+        # 解析结果快照，配置文件未变化时跳过 INI 解析
+        self.snapshot_path = Path(f"{config_path}.cache")
+        self._snapshot_key = None
+        # 内存中的配置是由哪个版本的文件得到的（修改时间、大小、哈希），快照以它为键
+        self._config_key = None
+        # conf.d 分类文件，按需加载
+        self.conf_dir = Path(config_path).parent / 'conf.d'
+        self.manifest_path = self.conf_dir / 'manifest.ini'
+        self.packs = {}
+        self._pack_tools = {}
+        self.tools = {}
+        self._tool_list = None
+        # 延迟写入：set() 只标记脏数据，静默 save_delay 秒后统一落盘
+        self.save_delay = 1.0
+        self._lock = threading.RLock()
+        self._flush_timer = None
+        self._batch_depth = 0
         self.load_config()
+        atexit.register(self.flush)
 
     def get_theme(self):
         """获取当前主题"""
-        return self.get('set', 'theme', 'vapor')
+        return self.get('set', 'theme', default_theme)
+
+    @staticmethod
+    def peek_setting(config_path, section, key, fallback=None):
+        """只扫描到指定节读取一个设置，不解析整个配置文件（启动时尽早取得主题）"""
+        header = f"[{section}]"
+        in_section = False
+        try:
+            with open(config_path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('['):
+                        if in_section:
+                            break
+                        in_section = line == header
+                    elif in_section and line and line[0] not in '#;':
+                        match = re.match(r'([^=:]+)[=:](.*)', line)
+                        if match and match.group(1).strip().lower() == key:
+                            return match.group(2).strip()
+        except (OSError, UnicodeDecodeError):
+            pass
+        return fallback
 
     def set_theme(self, theme):
         """设置主题"""
@@ -66,12 +385,279 @@ class ConfigManager:
         """加载配置文件"""
         if not Path(self.config_path).exists():
             raise FileNotFoundError(f"配置文件 {self.config_path} 不存在!")
-        self.config.read(self.config_path, encoding='utf-8')
+        text = self.document.load()
+        self._config_key = self._document_key()
+        config = CatalogParser()
+        sections = self._load_snapshot()
+        if sections is not None:
+            config.load_sections(sections)
+        else:
+            config.read_string(text, source=str(self.config_path))
+        self.config = config
+        self._build_registry()
+        if sections is None:
+            self.save_snapshot()
+        self._load_manifest()
+
+    def _load_manifest(self):
+        """读取 conf.d 清单（分类名称和工具数量），分类文件本身按需解析"""
+        self.packs = {}
+        self._pack_tools = {}
+        if not self.conf_dir.is_dir():
+            return
+        manifest = configparser.ConfigParser(interpolation=None)
+        if self.manifest_path.exists():
+            manifest.read(self.manifest_path, encoding='utf-8')
+
+        stale = False
+        for path in sorted(self.conf_dir.glob('*.ini')):
+            if path == self.manifest_path:
+                continue
+            pack = CategoryPack(path.stem, path)
+            signature = pack.document._stat_signature()
+            entry = manifest[pack.category] if manifest.has_section(pack.category) else {}
+            if signature and entry.get('file') == path.name and entry.get('signature') == f"{signature[0]}:{signature[1]}":
+                pack.count = int(entry.get('count', 0))
+            else:
+                self._load_pack(pack)
+                stale = True
+            self.packs[pack.category] = pack
+        if stale or set(manifest.sections()) != set(self.packs):
+            self._save_manifest()
+
+    def _save_manifest(self):
+        """写入 conf.d 清单"""
+        manifest = configparser.ConfigParser(interpolation=None)
+        for category, pack in self.packs.items():
+            signature = pack.document.signature or pack.document._stat_signature()
+            manifest[category] = {
+                'file': pack.document.path.name,
+                'count': str(pack.count),
+                'signature': f"{signature[0]}:{signature[1]}",
+            }
+        buffer = io.StringIO()
+        manifest.write(buffer)
+        try:
+            IniDocument(self.manifest_path)._atomic_write(buffer.getvalue())
+        except OSError as e:
+            logging.warning(f"写入 conf.d 清单失败: {e}")
+
+    def _parse_pack(self, pack):
+        """解析分类文件（不修改已加载的工具）"""
+        config = CatalogParser()
+        config.read_string(pack.document.load(), source=str(pack.document.path))
+        return config
+
+    def _load_pack(self, pack, config=None):
+        """加入分类文件中的工具（config 为已解析的结果，为 None 时现场解析），返回新加载的工具"""
+        if config is None:
+            config = self._parse_pack(pack)
+        pack.config = config
+        tools = []
+        for section, values in config.raw_sections().items():
+            if section in self.tools:
+                logging.warning(f"{pack.document.path.name} 中的工具 {section} 与已有工具重名，已忽略")
+                continue
+            tool = Tool.from_section(section, values)
+            tool.category = pack.category
+            self.tools[section] = tool
+            self._pack_tools[section] = pack
+            tools.append(tool)
+        pack.count = self._pack_count(pack)
+        self._tool_list = None
+        return tools
+
+    def _pack_count(self, pack):
+        """分类文件中实际加入的工具数量（不含与已有工具重名而被忽略的）"""
+        return sum(1 for section in pack.config.sections() if self._pack_tools.get(section) is pack)
+
+    def load_category(self, category):
+        """首次打开分类时解析对应的 conf.d 文件"""
+        pack = self.packs.get(category)
+        if pack is None or pack.loaded:
+            return []
+        with self._lock:
+            return self._install_pack(pack)
+
+    def _install_pack(self, pack, config=None):
+        """加载分类文件；清单中的数量与实际加入的不同时（如有重名工具）更新清单"""
+        count = pack.count
+        tools = self._load_pack(pack, config)
+        if pack.count != count:
+            self._save_manifest()
+        return tools
+
+    def parse_category(self, category):
+        """在后台线程中预先解析尚未加载的分类文件，结果交给 install_category"""
+        pack = self.packs.get(category)
+        with self._lock:
+            if pack is None or pack.loaded:
+                return None
+            return self._parse_pack(pack)
+
+    def install_category(self, category, config):
+        """加入预先解析好的分类文件（分类已经加载时忽略）"""
+        pack = self.packs.get(category)
+        with self._lock:
+            if pack is None or pack.loaded:
+                return []
+            return self._install_pack(pack, config)
+
+    def is_category_loaded(self, category):
+        """分类是否已全部加载"""
+        pack = self.packs.get(category)
+        return pack is None or pack.loaded
+
+    def get_pending_count(self, category):
+        """尚未加载的分类文件中的工具数量"""
+        pack = self.packs.get(category)
+        return pack.count if pack is not None and not pack.loaded else 0
+
+    def apply_reload(self, reloaded):
+        """应用后台重新解析的配置，返回变化的工具"""
+        with self._lock:
+            old_sections = self.config.raw_sections()
+            # 尚未写入的本地修改优先
+            for section in self.document.dirty:
+                if section in old_sections:
+                    reloaded.config[section] = old_sections[section]
+                else:
+                    reloaded.config.remove_section(section)
+            new_sections = reloaded.config.raw_sections()
+
+            changes = ConfigChanges()
+            for section, values in new_sections.items():
+                if section in reserved_sections:
+                    if old_sections.get(section) != values:
+                        changes.settings.append(section)
+                elif section in self._pack_tools:
+                    # 与已加载的 conf.d 工具重名：和 _load_pack 一样保留已有的工具
+                    if section not in old_sections:
+                        logging.warning(
+                            f"{self.document.path.name} 中的工具 {section} 与 "
+                            f"{self._pack_tools[section].document.path.name} 中的工具重名，已忽略"
+                        )
+                elif section not in old_sections:
+                    changes.added.append(Tool.from_section(section, values))
+                elif old_sections[section] != values:
+                    changes.changed.append((self.tools[section], Tool.from_section(section, values)))
+            for section in old_sections:
+                if section not in new_sections and section not in reserved_sections and section not in self._pack_tools:
+                    changes.removed.append(self.tools[section])
+
+            self.config = reloaded.config
+            self.document.text = reloaded.text
+            self.document.signature = reloaded.signature
+            self.document.digest = reloaded.digest
+            self.document.newline = reloaded.newline
+            self.document._spans = None
+            self._config_key = self._document_key()
+            for tool in changes.removed:
+                del self.tools[tool.name]
+            for tool in changes.added:
+                self.tools[tool.name] = tool
+            for _, tool in changes.changed:
+                self.tools[tool.name] = tool
+            if changes:
+                self._tool_list = None
+            return changes
+
+    def _document_key(self):
+        """快照键：配置文件的修改时间、大小和内容哈希"""
+        if self.document.signature is None:
+            return None
+        return (*self.document.signature, self.document.digest)
+
+    def _load_snapshot(self):
+        """读取与当前配置文件匹配的快照"""
+        if not CatalogParser.fast:
+            return None
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                data = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(data, dict) or data.get('version') != snapshot_version:
+            return None
+        key = self._config_key
+        if key is None or tuple(data.get('key', ())) != key:
+            return None
+        self._snapshot_key = key
+        return data['sections']
+
+    def save_snapshot(self):
+        """将解析结果写入快照（配置未变化或有尚未写入的修改时跳过）"""
+        with self._lock:
+            key = self._config_key
+            if key is None or key == self._snapshot_key or self.document.dirty or not CatalogParser.fast:
+                return
+            data = {'version': snapshot_version, 'key': key, 'sections': self.config.raw_sections()}
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix=self.snapshot_path.name + '.', suffix='.tmp', dir=self.snapshot_path.parent)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(marshal.dumps(data))
+                os.replace(tmp_path, self.snapshot_path)
+                self._snapshot_key = key
+            except (OSError, ValueError) as e:
+                logging.warning(f"写入配置快照失败: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
+    def _build_registry(self):
+        """根据配置构建工具注册表"""
+        self.tools = {
+            section: Tool.from_section(section, values)
+            for section, values in self.config.raw_sections().items()
+            if section not in reserved_sections
+        }
+        self._tool_list = None
 
     def save_config(self):
         """保存配置文件"""
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            self.config.write(f)
+        with self._lock:
+            self._cancel_flush_timer()
+            self.document.save(self.config)
+            # 合并了外部修改时签名被清空，内存中的配置仍对应原来的文件
+            if self.document.signature is not None:
+                self._config_key = self._document_key()
+
+    def flush(self):
+        """立即写入尚未保存的修改"""
+        with self._lock:
+            if self.document.dirty:
+                self.save_config()
+            else:
+                self._cancel_flush_timer()
+
+    @contextmanager
+    def transaction(self):
+        """批量修改，结束时只写入一次"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+
+    def _mark_dirty(self, section):
+        """标记配置节已修改，并安排延迟写入"""
+        self.document.mark(section)
+        if self._batch_depth:
+            return
+        self._cancel_flush_timer()
+        self._flush_timer = threading.Timer(self.save_delay, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _cancel_flush_timer(self):
+        """取消待执行的延迟写入"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
 
     def get(self, section, key, default=None):
         """获取配置值"""
@@ -81,11 +667,14 @@ class ConfigManager:
             return default
 
     def set(self, section, key, value):
-        """设置配置值"""
-        if not self.config.has_section(section):
-            self.config.add_section(section)
-        self.config.set(section, key, value)
-        self.save_config()
+        """设置配置值（延迟写入）"""
+        with self._lock:
+            if self.get(section, key) == value:
+                return
+            if not self.config.has_section(section):
+                self.config.add_section(section)
+            self.config.set(section, key, value)
+            self._mark_dirty(section)
 
     def get_environments(self):
         """获取所有环境变量配置"""
@@ -93,25 +682,17 @@ class ConfigManager:
 
     def get_all_tools(self):
         """获取所有工具的配置"""
-        tools = []
-        for section in self.config.sections():
-            if section not in ['set', 'environments']:
-                tools.append({
-                    'name': section,
-                    'category': self.config[section].get('category', ''),
-                    'path': self.config[section].get('path', ''),
-                    'type': self.config[section].get('type', ''),
-                    'env': self.config[section].get('env', ''),
-                    'args': self.config[section].get('args', ''),
-                    'description': self.config[section].get('description', '')
-                })
-        return tools
+        if self._tool_list is None:
+            self._tool_list = list(self.tools.values())
+        return self._tool_list
+
+    def get_tool(self, name):
+        """按名称获取工具"""
+        return self.tools.get(name)
 
     def add_tool(self, name, category, path, tool_type, env='', args='', description=''):
         """添加新工具到配置"""
-        if name in self.config:
-            logging.warning(f"工具 {name} 已存在，将覆盖")
-        self.config[name] = {
+        values = {
             'category': category,
             'path': path,
             'type': tool_type,
@@ -119,123 +700,1451 @@ class ConfigManager:
             'args': args,
             'description': description
         }
-        self.save_config()
+        with self._lock:
+            if name in self.tools:
+                logging.warning(f"工具 {name} 已存在，将覆盖")
+            # 分类有 conf.d 文件时写入该文件，否则写入 config.ini
+            pack = self.packs.get(category)
+            if pack is not None and not pack.loaded:
+                self._load_pack(pack)
+            old_pack = self._pack_tools.get(name)
+            if old_pack is not None and old_pack is not pack:
+                self._remove_from_pack(old_pack, name)
+            if pack is None:
+                self.config[name] = values
+                self.document.mark(name)
+                self.save_config()
+            else:
+                if name in self.config:
+                    self.config.remove_section(name)
+                    self.document.mark(name)
+                    self.save_config()
+                pack.config[name] = values
+                pack.document.mark(name)
+                pack.document.save(pack.config)
+                self._pack_tools[name] = pack
+                pack.count = self._pack_count(pack)
+                self._save_manifest()
+        tool = Tool(name, category, path, tool_type, env, args, description)
+        self.tools[name] = tool
+        self._tool_list = None
+        return tool
 
     def remove_tool(self, name):
         """从配置中移除工具"""
-        if name in self.config:
-            self.config.remove_section(name)
-            self.save_config()
+        with self._lock:
+            pack = self._pack_tools.get(name)
+            if pack is not None:
+                self._remove_from_pack(pack, name)
+            elif name in self.config:
+                self.config.remove_section(name)
+                self.document.mark(name)
+                self.save_config()
+            else:
+                return None
+        self._tool_list = None
+        return self.tools.pop(name, None)
+
+    def _remove_from_pack(self, pack, name):
+        """从分类文件中移除工具"""
+        pack.config.remove_section(name)
+        pack.document.mark(name)
+        pack.document.save(pack.config)
+        pack.count = self._pack_count(pack)
+        del self._pack_tools[name]
+        self._save_manifest()
 
     def get_columns(self):
         """获取每行显示的工具数量"""
         return self.config.getint('set', 'columns', fallback=5)
 
+    def get_view_cache_size(self):
+        """获取保留的分类视图数量"""
+        return max(1, self.config.getint('set', 'view_cache_size', fallback=4))
+
     def set_columns(self, columns):
         """设置每行显示的工具数量"""
         self.set('set', 'columns', str(columns))
 
     def set_window_size(self, width, height):
         """设置窗口大小"""
-        self.set('set', 'window_width', str(width))
-        self.set('set', 'window_height', str(height))
+        with self.transaction():
+            self.set('set', 'window_width', str(width))
+            self.set('set', 'window_height', str(height))
+
+class ConfigChanges:
+    """配置重新加载后的差异"""
+    __slots__ = ('added', 'removed', 'changed', 'settings')
+
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.changed = []
+        self.settings = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed or self.settings)
+
+    def categories(self):
+        """受影响的分类"""
+        categories = {tool.category for tool in self.added + self.removed}
+        for old_tool, new_tool in self.changed:
+            categories.add(old_tool.category)
+            categories.add(new_tool.category)
+        return categories
+
+
+class ReloadedConfig:
+    """后台线程解析出的配置"""
+    __slots__ = ('config', 'text', 'signature', 'digest', 'newline')
+
+    def __init__(self, config, text, signature, digest, newline='\n'):
+        self.config = config
+        self.text = text
+        self.signature = signature
+        self.digest = digest
+        self.newline = newline
+
+
+class ConfigWatcher:
+    """后台轮询配置文件，发现外部修改后在工作线程中重新解析"""
+    def __init__(self, config_manager, interval=1.0):
+        self.config_manager = config_manager
+        self.interval = interval
+        self.results = queue.Queue()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_signature = None
+
+    def start(self):
+        """启动监视线程"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ConfigWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """停止监视线程"""
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            reloaded = self.check()
+            if reloaded is not None:
+                self.results.put(reloaded)
+
+    def check(self):
+        """检查配置文件是否被外部修改，是则重新解析（在工作线程中调用），否则返回 None"""
+        document = IniDocument(self.config_manager.config_path)
+        signature = document._stat_signature()
+        if signature is None or signature in (self.config_manager.document.signature, self._last_signature):
+            return None
+        self._last_signature = signature
+        try:
+            text = document.load()
+            if document.digest == self.config_manager.document.digest:
+                return None
+            config = CatalogParser()
+            config.read_string(text, source=str(document.path))
+        except (OSError, UnicodeDecodeError, configparser.Error) as e:
+            logging.warning(f"重新加载配置文件失败: {e}")
+            return None
+        return ReloadedConfig(config, text, document.signature, document.digest, document.newline)
+
+    def poll(self):
+        """取出所有已解析完成的配置（在 Tk 线程中调用）"""
+        reloaded = []
+        while True:
+            try:
+                reloaded.append(self.results.get_nowait())
+            except queue.Empty:
+                return reloaded
+
+
+class LaunchSpec:
+    """编译好的工具启动方式（不经过 shell）"""
+    __slots__ = ('argv', 'cwd', 'env', 'console')
+
+    def __init__(self, argv, cwd, env=None, console=False):
+        self.argv = argv
+        self.cwd = cwd
+        # 子进程的环境变量，None 表示继承当前进程
+        self.env = env
+        # 是否在新的命令行窗口中运行（运行结束后窗口保留）
+        self.console = console
+
+
+class ArgsError(ValueError):
+    """工具的参数字符串无法解析（如引号不成对）"""
+
+
+def split_args(args):
+    """按引号拆分参数字符串（反斜杠保持原样，兼容 Windows 路径）"""
+    lexer = shlex.shlex(args, posix=True)
+    lexer.whitespace_split = True
+    lexer.escape = ''
+    lexer.commenters = ''
+    return list(lexer)
+
+
+class LaunchBackend(ABC):
+    """启动工具的平台后端：运行时的位置、哪些类型在命令行窗口中运行、如何创建进程"""
+    name = ''
+    # 在新的命令行窗口中运行的工具类型
+    console_types = ()
+
+    @abstractmethod
+    def runtime(self, name, env_path):
+        """解释器（python / java）的路径，未指定环境时从 PATH 中查找"""
+
+    def batch_argv(self, path):
+        """批处理文件的 argv 前缀，不支持时抛出 ValueError"""
+        raise ValueError("当前平台不支持 bat 类型的工具")
+
+    @abstractmethod
+    def spawn(self, spec):
+        """不经过 shell 创建进程，返回 (Popen, 实际执行的 argv)"""
+
+
+class WindowsBackend(LaunchBackend):
+    """Windows：命令行类工具在新的 cmd 窗口中运行"""
+    name = 'windows'
+    console_types = ('py', 'python', 'jcmd', 'cmd')
+
+    def runtime(self, name, env_path):
+        if env_path is None:
+            return name
+        return str(Path(env_path, f"{name}.exe").resolve())
+
+    def batch_argv(self, path):
+        return [os.environ.get('COMSPEC', 'cmd.exe'), '/c', str(path)]
+
+    def spawn(self, spec):
+        import subprocess
+        if not spec.console:
+            return subprocess.Popen(spec.argv, cwd=spec.cwd, env=spec.env), spec.argv
+        # 在新窗口中用 cmd /k 运行，结束后窗口保留；
+        # cmd /k 会去掉整条命令最外层的一对引号，所以再包一层
+        comspec = os.environ.get('COMSPEC', 'cmd.exe')
+        args = f'"{comspec}" /k "{subprocess.list2cmdline(spec.argv)}"'
+        process = subprocess.Popen(
+            args, cwd=spec.cwd, env=spec.env, creationflags=subprocess.CREATE_NEW_CONSOLE
+        )
+        return process, [comspec, '/k'] + spec.argv
+
+
+class LinuxBackend(LaunchBackend):
+    """Linux：cmd / jcmd 类型在终端模拟器中运行，py / jar 等直接运行"""
+    name = 'linux'
+    console_types = ('jcmd', 'cmd')
+    # 终端模拟器和“执行命令”参数，按顺序查找第一个可用的
+    terminals = (
+        ('x-terminal-emulator', ['-e']),
+        ('gnome-terminal', ['--']),
+        ('konsole', ['-e']),
+        ('xfce4-terminal', ['-x']),
+        ('mate-terminal', ['-x']),
+        ('alacritty', ['-e']),
+        ('kitty', []),
+        ('xterm', ['-e']),
+    )
+    # 命令结束后留在终端中的 shell（相当于 cmd /k），命令通过 "$@" 传入，不再解析
+    hold_script = '"$@"; exec "${SHELL:-/bin/sh}"'
+
+    def __init__(self):
+        self._terminal = None
+        self._terminal_detected = False
+        self._lock = threading.Lock()
+
+    @property
+    def terminal(self):
+        """可用的终端模拟器 argv 前缀（第一次使用时检测并缓存，没有时为 None）"""
+        with self._lock:
+            if not self._terminal_detected:
+                self._terminal = self._detect_terminal()
+                self._terminal_detected = True
+                if self._terminal is None:
+                    logging.warning("未找到终端模拟器，命令行类工具将直接运行")
+                else:
+                    logging.info(f"使用终端模拟器: {self._terminal[0]}")
+            return self._terminal
+
+    def _detect_terminal(self):
+        """查找终端模拟器，$TERMINAL 优先（已知的终端使用表中的参数，未知的用 -e）"""
+        candidates = list(self.terminals)
+        terminal = os.environ.get('TERMINAL')
+        if terminal:
+            exec_args = dict(self.terminals).get(os.path.basename(terminal), ['-e'])
+            candidates.insert(0, (terminal, exec_args))
+        for name, exec_args in candidates:
+            path = shutil.which(name)
+            if path:
+                return [path] + exec_args
+        return None
+
+    def runtime(self, name, env_path):
+        # 很多发行版只有 python3
+        names = (name, f"{name}3") if name == 'python' else (name,)
+        if env_path is None:
+            for candidate in names:
+                path = shutil.which(candidate)
+                if path:
+                    return path
+            return name
+        for candidate in names:
+            path = Path(env_path, candidate)
+            if path.exists():
+                return str(path.resolve())
+        return str(Path(env_path, name).resolve())
+
+    def spawn(self, spec):
+        import subprocess
+        argv = spec.argv
+        terminal = self.terminal if spec.console else None
+        if terminal is not None:
+            argv = terminal + ['/bin/sh', '-c', self.hold_script, 'sh'] + argv
+        return subprocess.Popen(argv, cwd=spec.cwd, env=spec.env), argv
+
+
+def select_launch_backend():
+    """按平台选择启动后端（启动时选择一次）"""
+    if os.name == 'nt':
+        return WindowsBackend()
+    return LinuxBackend()
+
 
 class EnvironmentManager:
     """管理环境变量的类"""
-    def __init__(self, config_manager):
+    def __init__(self, config_manager, backend=None):
         self.config_manager = config_manager
         self.environments = self.config_manager.get_environments()
         self.current_dir = Path(sys.argv[0]).parent.resolve()
+        self.backend = backend or select_launch_backend()
+        # 每个工具编译好的启动方式 {工具名: (工具, LaunchSpec)}，工具或环境变化后重新编译
+        self._specs = {}
+
+    def reload(self):
+        """环境配置变化后重新读取，并丢弃编译好的启动方式"""
+        self.environments = self.config_manager.get_environments()
+        self._specs = {}
+
+    def get_launch_spec(self, tool):
+        """获取工具的启动方式（缓存）"""
+        cached = self._specs.get(tool.name)
+        if cached is not None and cached[0] is tool:
+            return cached[1]
+        spec = self.compile(tool)
+        self._specs[tool.name] = (tool, spec)
+        return spec
 
-    def run_with_environment(self, tool_type, env_name='', path='', args=''):
-        """使用指定环境运行工具"""
-        env_path = self.config_manager.get_environment_path(env_name)
+    def compile(self, tool):
+        """把工具配置编译为 argv、工作目录和环境变量
+
+        参数无法解析时抛出 ArgsError，不支持的类型抛出 ValueError。
+        """
+        env_path = self.config_manager.get_environment_path(tool.env)
+        path = self.current_dir / tool.path
+        try:
+            args = split_args(tool.args)
+        except ValueError as e:
+            raise ArgsError(f"工具 {tool.name} 的参数无法解析: {tool.args!r}（{e}）") from e
+        backend = self.backend
+
+        tool_type = tool.type
+        if tool_type in ['py', 'python']:
+            argv = [backend.runtime('python', env_path), str(path)] + args
+        elif tool_type in ['java', 'jar', 'jcmd']:
+            argv = [backend.runtime('java', env_path), '-jar', str(path)] + args
+        elif tool_type in ['exe', 'cmd']:
+            argv = [str(path)] + args
+        elif tool_type == 'bat':
+            argv = backend.batch_argv(path) + args
+        else:
+            raise ValueError(f"不支持的工具类型: {tool_type}")
 
-        path = self.current_dir / path
-        cdpath = os.path.dirname(path)
+        env = None
+        if env_path is not None:
+            # 环境目录放在 PATH 最前面，工具启动的子进程也使用同一环境
+            env = dict(os.environ)
+            env['PATH'] = str(env_path) + os.pathsep + env.get('PATH', '')
+        return LaunchSpec(argv, os.path.dirname(path), env, tool_type in backend.console_types)
+
+    def run_with_environment(self, tool):
+        """使用指定环境运行工具，返回启动记录（命令、工作目录、启动耗时、进程号、结果）
+
+        在后台线程中调用，不操作界面；出错时结果为 missing / unsupported / error，
+        错误信息在 launch['error'] 中，由界面线程显示。
+        """
+        path = self.current_dir / tool.path
+        launch = {
+            'type': tool.type, 'env': tool.env, 'argv': None, 'cwd': os.path.dirname(path),
+            'latency_ms': None, 'pid': None, 'outcome': 'started'
+        }
         if not path.exists():
-            messagebox.showerror("错误", f"工具路径 {path} 不存在")
-            return
+            launch['outcome'] = 'missing'
+            launch['error'] = f"工具路径 {path} 不存在"
+            logging.error(launch['error'])
+            return launch
 
         try:
-            if tool_type in ['py', 'python']:
-                python_exe = Path(env_path, 'python.exe' if os.name == 'nt' else 'python').resolve()
-                command = f'cd "{cdpath}" && "{python_exe}" "{path}" {args}'
-                command = f'start cmd /k "{command}"'
-            elif tool_type in ['java', 'jar']:
-                java_exe = Path(env_path, 'java.exe' if os.name == 'nt' else 'java').resolve()
-                command = f'cd "{cdpath}" && "{java_exe}" -jar "{path}" {args}'
-            elif tool_type == 'jcmd':
-                java_exe = Path(env_path, 'java.exe' if os.name == 'nt' else 'java').resolve()
-                command = f'cd "{cdpath}" && "{java_exe}" -jar "{path}" {args}'
-                command = f'start cmd /k "{command}"'
-            elif tool_type == 'exe':
-                command = f'cd "{cdpath}" && "{path}" {args}'
-            elif tool_type == 'cmd':
-                command = f'cd "{cdpath}" && "{path}" {args}'
-                command = f'start cmd /k "{command}"'
-            elif tool_type == 'bat':
-                command = f'cd "{cdpath}" && cmd /c "{path}" {args}'
-            else:
-                messagebox.showerror("错误", f"不支持的工具类型: {tool_type}")
-                return
+            spec = self.get_launch_spec(tool)
+        except ArgsError as e:
+            launch['outcome'] = 'error'
+            launch['error'] = str(e)
+            logging.error(launch['error'])
+            return launch
+        except ValueError as e:
+            launch['outcome'] = 'unsupported'
+            launch['error'] = str(e)
+            logging.error(launch['error'])
+            return launch
 
-            logging.info(f"使用命令: {command}")
-            subprocess.Popen(command, shell=True)
+        try:
+            start = time.perf_counter()
+            process, argv = self.backend.spawn(spec)
+            launch['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            launch['pid'] = process.pid
+            launch['argv'] = argv
+            logging.info(f"使用命令: {argv}，工作目录: {spec.cwd}")
         except Exception as e:
-            messagebox.showerror("错误", f"执行工具时出错: {e}")
             logging.error(f"执行工具时出错: {e}")
+            launch['outcome'] = 'error'
+            launch['error'] = f"执行工具时出错: {e}"
+        return launch
+
+
+class LaunchLog:
+    """工具启动记录（JSON Lines）和按工具的追加式索引
+
+    每次启动在 launches.jsonl 追加一行 JSON，同时在 launches.idx 追加一行
+    “偏移<TAB>工具名”。查询某个工具最近的启动记录时只读索引和对应的几行，
+    不扫描整个记录文件；索引缺失或落后时从记录文件补齐。
+    多个实例写同一个文件时，索引中可能有重复或乱序的行，读取时按偏移去重。
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix('.idx')
+        self._lock = threading.Lock()
+        # {工具名: [记录偏移（升序）]}，第一次查询时加载
+        self._offsets = None
+        # 已加入 _offsets 的记录偏移
+        self._seen = set()
+        # 索引覆盖到的记录文件位置
+        self._indexed_end = 0
+        # 已读取的索引文件长度
+        self._index_size = 0
+
+    def record(self, tool, launch):
+        """追加一条启动记录"""
+        entry = {'time': datetime.datetime.now().isoformat(timespec='milliseconds'), 'tool': tool}
+        entry.update(launch)
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'ab') as f:
+                    f.seek(0, os.SEEK_END)
+                    offset = f.tell()
+                    f.write(line)
+                with open(self.index_path, 'a', encoding='utf-8') as f:
+                    f.write(f"{offset}\t{tool}\n")
+            except OSError as e:
+                logging.error(f"写入启动记录时出错: {e}")
+                return
+            if self._offsets is not None and self._indexed_end == offset:
+                self._add_offset(tool, offset)
+                self._indexed_end = offset + len(line)
+
+    def _add_offset(self, tool, offset):
+        """把记录加入内存中的索引，已有时返回 False"""
+        if offset in self._seen:
+            return False
+        self._seen.add(offset)
+        offsets = self._offsets.setdefault(tool, [])
+        if offsets and offsets[-1] > offset:
+            bisect.insort(offsets, offset)
+        else:
+            offsets.append(offset)
+        return True
+
+    def _read_entry(self, f, offset):
+        """读取偏移处的一条记录（不完整或无法解析时返回 None）"""
+        f.seek(offset)
+        line = f.readline()
+        if not line.endswith(b'\n'):
+            return None, offset
+        try:
+            return json.loads(line), offset + len(line)
+        except ValueError:
+            return None, offset + len(line)
+
+    def _read_index(self):
+        """读取索引文件中上次之后追加的完整行，返回 [(偏移, 工具名)]"""
+        try:
+            with open(self.index_path, 'rb') as f:
+                f.seek(self._index_size)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        data = data[:data.rfind(b'\n') + 1]
+        self._index_size += len(data)
+        entries = []
+        for line in data.decode('utf-8', errors='replace').splitlines():
+            offset, _, tool = line.partition('\t')
+            if tool and offset.isdigit():
+                entries.append((int(offset), tool))
+        return entries
+
+    def _load_index(self):
+        """读取索引文件，并确认偏移最大的一条索引和记录文件一致"""
+        self._offsets = {}
+        self._seen = set()
+        self._indexed_end = 0
+        self._index_size = 0
+        for offset, tool in self._read_index():
+            self._add_offset(tool, offset)
+        if not self._seen:
+            return
+        last = max(self._seen)
+        try:
+            with open(self.path, 'rb') as f:
+                entry, end = self._read_entry(f, last)
+        except FileNotFoundError:
+            entry = None
+        if entry is None or entry.get('tool') not in self._offsets or last not in self._offsets[entry['tool']]:
+            # 记录文件被截断或替换，索引作废，从头重建
+            logging.warning("启动记录索引与记录文件不一致，重建索引")
+            self.index_path.unlink()
+            self._offsets = {}
+            self._seen = set()
+            self._index_size = 0
+            return
+        self._indexed_end = end
+
+    def _catch_up(self):
+        """把索引之后追加的记录补进索引
+
+        先读取其他实例（或本实例）追加的索引行，只有索引中没有的记录才写入索引。
+        """
+        for offset, tool in self._read_index():
+            self._add_offset(tool, offset)
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size <= self._indexed_end:
+            return
+        added = []
+        with open(self.path, 'rb') as f:
+            offset = self._indexed_end
+            while offset < size:
+                entry, end = self._read_entry(f, offset)
+                if end == offset:
+                    break
+                if entry is not None and entry.get('tool') and self._add_offset(entry['tool'], offset):
+                    added.append(f"{offset}\t{entry['tool']}\n")
+                offset = end
+        self._indexed_end = offset
+        if added:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.writelines(added)
+
+    def recent(self, tool, limit=50):
+        """工具最近的启动记录（最新的在前）"""
+        with self._lock:
+            try:
+                if self._offsets is None:
+                    self._load_index()
+                self._catch_up()
+            except OSError as e:
+                logging.error(f"读取启动记录索引时出错: {e}")
+                return []
+            offsets = self._offsets.get(tool, [])[-limit:]
+            records = []
+            try:
+                with open(self.path, 'rb') as f:
+                    for offset in reversed(offsets):
+                        entry, _ = self._read_entry(f, offset)
+                        if entry is not None:
+                            records.append(entry)
+            except OSError as e:
+                logging.error(f"读取启动记录时出错: {e}")
+            return records
+
+# 排序选项对应的工具字段
+sort_fields = {"名称": 'name', "类型": 'type', "描述": 'description'}
+
+
+@functools.lru_cache(maxsize=None)
+def _load_pinyin():
+    """第一次排序时才导入 pypinyin（导入时会加载拼音词典）"""
+    try:
+        from pypinyin import lazy_pinyin
+    except ImportError:
+        return None
+    return lazy_pinyin
+
+
+def collation_key(text, limit=64):
+    """中文友好的排序键：有 pypinyin 时按拼音，否则按 GBK 编码（一级汉字按拼音排列）"""
+    text = text[:limit].lower()
+    lazy_pinyin = _load_pinyin()
+    if lazy_pinyin is not None:
+        return ' '.join(lazy_pinyin(text)).encode('utf-8')
+    return text.encode('gbk', errors='replace')
+
+
+class SearchIndex:
+    """工具搜索的倒排索引
+
+    对名称、类型、描述的小写文本建立单字和双字（bigram）索引，
+    中文不需要分词即可检索。查询时先求各 bigram 倒排表的交集得到候选，
+    再用子串匹配确认。
+    """
+    separator = '\x00'
+
+    def __init__(self):
+        self._texts = {}
+        self._postings = {}
+
+    @classmethod
+    def _tool_text(cls, tool):
+        """工具的可搜索文本（字段之间用分隔符隔开，避免跨字段匹配）"""
+        return cls.separator.join((tool.name, tool.type, tool.description)).lower()
+
+    @classmethod
+    def _grams(cls, text):
+        """文本中的单字和双字"""
+        grams = set(text)
+        grams.update(text[i:i + 2] for i in range(len(text) - 1))
+        grams = {gram for gram in grams if cls.separator not in gram}
+        return grams
+
+    def add(self, tool):
+        """将工具加入索引"""
+        self.remove(tool.name)
+        text = self._tool_text(tool)
+        self._texts[tool.name] = text
+        for gram in self._grams(text):
+            self._postings.setdefault(gram, set()).add(tool.name)
+
+    def remove(self, name):
+        """将工具移出索引"""
+        text = self._texts.pop(name, None)
+        if text is None:
+            return
+        for gram in self._grams(text):
+            names = self._postings.get(gram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._postings[gram]
+
+    def search(self, query):
+        """返回匹配的工具名称集合"""
+        query = query.lower()
+        if len(query) <= 2:
+            return set(self._postings.get(query, ()))
+        grams = {query[i:i + 2] for i in range(len(query) - 1)}
+        postings = []
+        for gram in grams:
+            names = self._postings.get(gram)
+            if not names:
+                return set()
+            postings.append(names)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for names in postings[1:]:
+            candidates &= names
+            if not candidates:
+                return candidates
+        texts = self._texts
+        return {name for name in candidates if query in texts[name]}
+
+    def refine(self, tools, query):
+        """在已有结果中继续过滤（query 须已转为小写）"""
+        texts = self._texts
+        return [tool for tool in tools if query in texts[tool.name]]
+
 
 class ToolManager:
     """管理工具的类"""
     def __init__(self, config_manager, environment_manager):
         self.config_manager = config_manager
         self.environment_manager = environment_manager
+        self.launch_log = LaunchLog(launch_log_file)
+        # 启动工具（路径检查、创建进程）在后台线程中进行
+        self._launcher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ToolLauncher")
+        self._categories = {}
+        self._category_lists = {}
+        self._search_index = None
+        # 目录版本号，任何增删改都会递增，用于使搜索缓存失效
+        self.version = 0
+        self._category_versions = {}
+        self.search_cache_size = 32
+        self._search_cache = OrderedDict()
+        self._search_cache_version = None
+        self._last_search = None
+        # 每种排序方式预先计算的顺序和名次 {排序: (有序列表, {名称: 名次})}
+        self._sort_orders = {}
+        self._sort_orders_version = None
+        # 工具增删改的监听者，参数为 ConfigChanges
+        self._listeners = []
+        self.rebuild_index()
+
+    def rebuild_index(self):
+        """重建分类索引"""
+        self._categories = {}
+        self._category_lists = {}
+        self._search_index = None
+        self.version += 1
+        for tool in self.config_manager.get_all_tools():
+            self._index_tool(tool)
+        # 尚未加载的 conf.d 分类先占位，保证分类顺序稳定
+        for category in self.config_manager.packs:
+            if not self.config_manager.is_category_loaded(category):
+                self._categories.setdefault(category, {})
+
+    def _ensure_category(self, category):
+        """按需加载 conf.d 中的分类"""
+        if not self.config_manager.is_category_loaded(category):
+            for tool in self.config_manager.load_category(category):
+                self._index_tool(tool)
 
-    def get_categories(self):
-        """获取所有工具分类"""
-        tools = self.config_manager.get_all_tools()
-        categories = {}
-        for tool in tools:
-            category = tool['category']
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(tool)
-        return categories
+    def get_all_tools(self):
+        """获取已加载的所有工具（未加载的 conf.d 分类由 CatalogLoader 在后台解析）"""
+        return self.config_manager.get_all_tools()
+
+    def get_pending_categories(self):
+        """尚未加载的 conf.d 分类"""
+        return [category for category in self.config_manager.packs
+                if not self.config_manager.is_category_loaded(category)]
+
+    def install_categories(self, parsed):
+        """加入后台解析好的分类 [(分类, 解析结果)]，并通知监听者"""
+        changes = ConfigChanges()
+        for category, config in parsed:
+            for tool in self.config_manager.install_category(category, config):
+                self._index_tool(tool)
+                changes.added.append(tool)
+        if changes:
+            self._notify(changes)
+        return changes
+
+    def _index_tool(self, tool):
+        """将工具加入分类索引"""
+        self._categories.setdefault(tool.category, {})[tool.name] = tool
+        self._category_lists.pop(tool.category, None)
+        self._bump_version(tool.category)
+        if self._search_index is not None:
+            self._search_index.add(tool)
+
+    def _unindex_tool(self, tool):
+        """将工具移出分类索引"""
+        tools = self._categories.get(tool.category)
+        if tools is None or tools.pop(tool.name, None) is None:
+            return
+        self._bump_version(tool.category)
+        if self._search_index is not None:
+            self._search_index.remove(tool.name)
+        self._category_lists.pop(tool.category, None)
+        if not tools and self.config_manager.is_category_loaded(tool.category):
+            del self._categories[tool.category]
+
+    def _bump_version(self, category):
+        """目录和分类版本号递增"""
+        self.version += 1
+        self._category_versions[category] = self.version
+
+    def get_category_version(self, category):
+        """分类的版本号，分类中的工具变化时改变"""
+        if category == "所有工具":
+            return self.version
+        return self._category_versions.get(category, 0)
+
+    def _reindex_tool(self, old_tool, new_tool):
+        """更新索引中的工具，分类不变时保持原有顺序"""
+        if old_tool.category == new_tool.category and old_tool.name in self._categories.get(old_tool.category, ()):
+            self._categories[new_tool.category][new_tool.name] = new_tool
+            self._category_lists.pop(new_tool.category, None)
+            self._bump_version(new_tool.category)
+            if self._search_index is not None:
+                self._search_index.add(new_tool)
+        else:
+            self._unindex_tool(old_tool)
+            self._index_tool(new_tool)
+
+    def get_category_names(self):
+        """获取分类名称（按首次出现顺序）"""
+        return list(self._categories)
+
+    def get_category_tools(self, category):
+        """获取指定分类下的工具"""
+        self._ensure_category(category)
+        tools = self._category_lists.get(category)
+        if tools is None:
+            tools = list(self._categories.get(category, {}).values())
+            self._category_lists[category] = tools
+        return tools
+
+    def get_category_count(self, category):
+        """获取指定分类下的工具数量（包括尚未加载的）"""
+        if category == "所有工具":
+            return sum(self.get_category_counts().values())
+        return len(self._categories.get(category, ())) + self.config_manager.get_pending_count(category)
+
+    def get_category_counts(self):
+        """获取每个分类的工具数量"""
+        return {category: self.get_category_count(category) for category in self._categories}
+
+    def build_search_index(self):
+        """构建搜索索引（已构建时直接返回），之后随增删工具增量更新"""
+        if self._search_index is None:
+            index = SearchIndex()
+            for tools in self._categories.values():
+                for tool in tools.values():
+                    index.add(tool)
+            self._search_index = index
+        return self._search_index
+
+    @property
+    def search_index(self):
+        """搜索索引（通常已由 CatalogLoader 在后台线程中构建）"""
+        return self.build_search_index()
+
+    def search_tools(self, category, query, sort_by=None):
+        """在分类中搜索并排序工具
+
+        结果按 (分类, 查询, 排序) 缓存；新查询包含上一次查询时，
+        直接在上一次（已排序的）结果中继续过滤。
+        """
+        query = query.lower()
+        if self._search_cache_version != self.version:
+            self._search_cache.clear()
+            self._last_search = None
+            self._search_cache_version = self.version
+
+        key = (category, query, sort_by)
+        result = self._search_cache.get(key)
+        if result is not None:
+            self._search_cache.move_to_end(key)
+            self._last_search = key
+            return result
+
+        last = self._last_search
+        if query and last and last[1] and last[0] == category and last[2] == sort_by and last[1] in query:
+            result = self.search_index.refine(self._search_cache[last], query)
+        else:
+            if category == "所有工具":
+                tools = self.get_all_tools()
+            else:
+                tools = self.get_category_tools(category)
+            if query:
+                matches = self.search_index.search(query)
+                tools = [tool for tool in tools if tool.name in matches]
+            result = self._sort_tools(tools, sort_by)
+
+        self._search_cache[key] = result
+        while len(self._search_cache) > self.search_cache_size:
+            self._search_cache.popitem(last=False)
+        self._last_search = key
+        return result
+
+    def _sort_order(self, sort_by):
+        """获取按指定方式排好序的全部工具及名次（每个目录版本只计算一次）"""
+        if self._sort_orders_version != self.version:
+            self._sort_orders = {}
+            self._sort_orders_version = self.version
+        order = self._sort_orders.get(sort_by)
+        if order is None:
+            field = sort_fields[sort_by]
+            tools = [tool for tools in self._categories.values() for tool in tools.values()]
+            name_keys = {tool.name: collation_key(tool.name) for tool in tools}
+            if field == 'name':
+                tools.sort(key=lambda x: (name_keys[x.name], x.name))
+            else:
+                field_keys = {}
+                for tool in tools:
+                    value = getattr(tool, field)
+                    if value not in field_keys:
+                        field_keys[value] = collation_key(value)
+                tools.sort(key=lambda x: (field_keys[getattr(x, field)], name_keys[x.name], x.name))
+            ranks = {tool.name: rank for rank, tool in enumerate(tools)}
+            order = (tools, ranks)
+            self._sort_orders[sort_by] = order
+        return order
+
+    def _sort_tools(self, tools, sort_by):
+        """按名称、类型或描述排序：结果多时按预排序列表筛选，少时按名次排序"""
+        if sort_by not in sort_fields or not tools:
+            return list(tools)
+        ordered, ranks = self._sort_order(sort_by)
+        if len(tools) * 8 >= len(ordered):
+            names = {tool.name for tool in tools}
+            return [tool for tool in ordered if tool.name in names]
+        return sorted(tools, key=lambda x: ranks.get(x.name, len(ranks)))
 
     def run_tool(self, tool):
         """运行指定工具"""
-        self.environment_manager.run_with_environment(
-            tool['type'], tool['env'], tool['path'], tool['args']
-        )
+        logging.info(f"运行工具 {tool.name}")
+        launch = self.environment_manager.run_with_environment(tool)
+        self.launch_log.record(tool.name, launch)
+        return launch
+
+    def submit_tool(self, tool):
+        """在后台线程中运行工具，立即返回 Future（结果为启动记录）"""
+        return self._launcher.submit(self.run_tool, tool)
+
+    def get_recent_launches(self, name, limit=50):
+        """工具最近的启动记录（最新的在前）"""
+        return self.launch_log.recent(name, limit)
 
     def add_tool(self, name, category, path, tool_type, env='', args='', description=''):
         """添加新工具"""
-        self.config_manager.add_tool(name, category, path, tool_type, env, args, description)
+        self._ensure_category(category)
+        old_tool = self.config_manager.get_tool(name)
+        tool = self.config_manager.add_tool(name, category, path, tool_type, env, args, description)
+        changes = ConfigChanges()
+        if old_tool is not None:
+            self._reindex_tool(old_tool, tool)
+            changes.changed.append((old_tool, tool))
+        else:
+            self._index_tool(tool)
+            changes.added.append(tool)
+        self._notify(changes)
+        return tool
 
     def remove_tool(self, name):
         """移除工具"""
-        self.config_manager.remove_tool(name)
+        tool = self.config_manager.remove_tool(name)
+        if tool is not None:
+            self._unindex_tool(tool)
+            changes = ConfigChanges()
+            changes.removed.append(tool)
+            self._notify(changes)
+        return tool
+
+    def apply_reload(self, reloaded):
+        """应用重新加载的配置，只更新变化的工具"""
+        changes = self.config_manager.apply_reload(reloaded)
+        for tool in changes.removed:
+            self._unindex_tool(tool)
+        for old_tool, new_tool in changes.changed:
+            self._reindex_tool(old_tool, new_tool)
+        for tool in changes.added:
+            self._index_tool(tool)
+        if 'environments' in changes.settings:
+            self.environment_manager.reload()
+        if changes.added or changes.removed or changes.changed:
+            self._notify(changes)
+        return changes
+
+    def add_listener(self, callback):
+        """注册工具变化的监听者"""
+        self._listeners.append(callback)
+
+    def _notify(self, changes):
+        """通知监听者工具发生了变化"""
+        for callback in self._listeners:
+            callback(changes)
+
+
+class CatalogLoader:
+    """在后台线程中加载工具目录（解析配置、建立索引），结果通过队列交给 Tk 线程"""
+    def __init__(self, config_path):
+        self.config_path = config_path
+        self.results = queue.Queue()
+        # 目录加载完成后继续解析 conf.d 中其余的分类：[(分类, 解析结果)]
+        self.packs = queue.Queue()
+        self.packs_done = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """启动加载线程"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="CatalogLoader", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            config_manager = ConfigManager(self.config_path)
+            environment_manager = EnvironmentManager(config_manager)
+            tool_manager = ToolManager(config_manager, environment_manager)
+            # 第一个显示的是“所有工具”：预先计算已加载工具的默认排序
+            tool_manager.search_tools("所有工具", "", "名称")
+            # 搜索索引也在这里建好，之后加入的分类增量更新，第一次输入搜索词时无需等待
+            tool_manager.build_search_index()
+            pending = tool_manager.get_pending_categories()
+        except Exception as e:
+            logging.error(f"加载配置文件时出错: {e}")
+            self.packs_done.set()
+            self.results.put(e)
+            return
+        logging.info(
+            f"工具目录加载完成: {len(config_manager.tools)} 个工具，"
+            f"用时 {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        self.results.put((config_manager, tool_manager))
+        self._parse_packs(config_manager, pending)
+
+    def _parse_packs(self, config_manager, categories):
+        """解析其余的分类文件；加入目录（修改索引）在 Tk 线程中进行"""
+        try:
+            for category in categories:
+                try:
+                    config = config_manager.parse_category(category)
+                except Exception as e:
+                    logging.error(f"解析分类 {category} 时出错: {e}")
+                    continue
+                if config is not None:
+                    self.packs.put((category, config))
+        finally:
+            self.packs_done.set()
+
+    def poll(self):
+        """取出加载结果（在 Tk 线程中调用，尚未完成时返回 None）"""
+        try:
+            return self.results.get_nowait()
+        except queue.Empty:
+            return None
+
+    def poll_packs(self):
+        """取出已解析好的分类（在 Tk 线程中调用）"""
+        parsed = []
+        while True:
+            try:
+                parsed.append(self.packs.get_nowait())
+            except queue.Empty:
+                return parsed
+
+
+class ToolGridView:
+    """一个分类的工具视图：虚拟化的按钮网格
+
+    只为可见行（加少量预留行）放置按钮，按钮来自视图自己的按钮池，
+    不再需要时隐藏而不销毁。
+    """
+    tile_padding = 10
+    overscan_rows = 2
+
+    def __init__(self, master, run_tool, show_context_menu, launching=()):
+        self.run_tool = run_tool
+        self.show_context_menu = show_context_menu
+        # 正在启动的工具名称，按钮显示为启动中
+        self.launching = launching
+        # 视图内容对应的 (搜索词, 排序, 分类版本)，不变时无需重新渲染
+        self.key = None
+
+        self.frame = ttkb.Frame(master)
+        self.scrollbar = ttkb.Scrollbar(self.frame, command=self._on_scroll)
+        self.scrollbar.pack(side=ttkb.RIGHT, fill=ttkb.Y)
+        self.viewport = ttkb.Frame(self.frame)
+        self.viewport.pack(side=ttkb.LEFT, fill=ttkb.BOTH, expand=True)
+        self.viewport.bind("<Configure>", lambda e: self.schedule_layout())
+        self._bind_mouse_wheel(self.viewport)
+
+        self._layout_job = None
+        self._tile_pool = []
+        self._tile_tools = []
+        self._tile_busy = []
+        self._visible_tiles = 0
+        self._empty_label = None
+        self._tools = []
+        self._columns = 1
+        self._scroll_y = 0
+        self._row_height = None
+
+    def pack(self):
+        """显示视图"""
+        self.frame.pack(fill=ttkb.BOTH, expand=True)
+
+    def pack_forget(self):
+        """隐藏视图（保留按钮和滚动位置）"""
+        self.frame.pack_forget()
+
+    def destroy(self):
+        """销毁视图"""
+        self.cancel_layout()
+        self.frame.destroy()
+
+    def cancel_layout(self):
+        """取消尚未执行的布局"""
+        if self._layout_job is not None:
+            self.frame.after_cancel(self._layout_job)
+            self._layout_job = None
+
+    def schedule_layout(self):
+        """合并多次滚动/尺寸变化，空闲时再布局"""
+        if self._layout_job is None:
+            self._layout_job = self.frame.after_idle(self.layout)
+
+    def reset_row_height(self):
+        """主题变化后重新测量行高"""
+        self._row_height = None
+        self.schedule_layout()
+
+    def show_empty(self, text):
+        """隐藏所有工具按钮并显示提示"""
+        self._tools = []
+        self._hide_tiles(0)
+        if self._empty_label is None:
+            self._empty_label = ttkb.Label(self.viewport)
+        self._empty_label.config(text=text)
+        self._empty_label.place(relx=0.5, y=20, anchor="n")
+        self.scrollbar.set(0, 1)
+
+    def show_tools(self, tools, columns, keep_position=False):
+        """显示工具列表（从顶部开始，或保持当前滚动位置）
+
+        已放置的按钮中工具没有变化的不会重新配置。
+        """
+        if self._empty_label is not None:
+            self._empty_label.place_forget()
+        self._tools = tools
+        self._columns = max(1, columns)
+        if not keep_position:
+            self._scroll_y = 0
+        self.layout()
+
+    def reflow(self, columns):
+        """按新列数重新摆放现有按钮，保持顶部可见的工具不变"""
+        columns = max(1, columns)
+        if not self._tools or columns == self._columns:
+            self._columns = columns
+            return
+        row_height = self._get_row_height()
+        first_index = (self._scroll_y // row_height) * self._columns
+        self._columns = columns
+        self._scroll_y = (first_index // columns) * row_height
+        self.layout()
+
+    def _bind_mouse_wheel(self, widget):
+        """绑定鼠标滚轮"""
+        widget.bind("<MouseWheel>", self._on_mouse_wheel)
+        widget.bind("<Button-4>", self._on_mouse_wheel)
+        widget.bind("<Button-5>", self._on_mouse_wheel)
+
+    def _get_tile(self, index):
+        """从按钮池中取出第 index 个按钮，不够时才创建"""
+        while len(self._tile_pool) <= index:
+            i = len(self._tile_pool)
+            btn = ttkb.Button(
+                self.viewport,
+                command=lambda i=i: self.run_tool(self._tile_tools[i]),
+                width=20
+            )
+
+            # 右键菜单
+            btn.bind("<Button-3>", lambda event, i=i: self.show_context_menu(event, self._tile_tools[i]))
+            self._bind_mouse_wheel(btn)
+
+            self._tile_pool.append(btn)
+            self._tile_tools.append(None)
+            self._tile_busy.append(False)
+        return self._tile_pool[index]
+
+    def _hide_tiles(self, start):
+        """隐藏（而不是销毁）从 start 开始的按钮"""
+        for btn in self._tile_pool[start:self._visible_tiles]:
+            btn.place_forget()
+        for i in range(start, len(self._tile_tools)):
+            self._tile_tools[i] = None
+        self._visible_tiles = min(self._visible_tiles, start)
+
+    def _get_row_height(self):
+        """每行高度（按钮高度 + 上下间距）"""
+        if self._row_height is None:
+            tile = self._get_tile(0)
+            tile.update_idletasks()
+            self._row_height = tile.winfo_reqheight() + 2 * self.tile_padding
+        return self._row_height
+
+    def layout(self):
+        """只为可见行放置按钮，滚动位置换算为行偏移"""
+        self._layout_job = None
+        tools = self._tools
+        if not tools:
+            return
+        width = self.viewport.winfo_width()
+        height = self.viewport.winfo_height()
+        if width <= 1 or height <= 1:
+            # 尚未显示，等 <Configure> 事件
+            return
+
+        columns = self._columns
+        padding = self.tile_padding
+        row_height = self._get_row_height()
+        total_rows = math.ceil(len(tools) / columns)
+        total_height = total_rows * row_height
+        self._scroll_y = max(0, min(self._scroll_y, total_height - height))
+
+        first_row = max(0, self._scroll_y // row_height - self.overscan_rows)
+        last_row = min(total_rows, (self._scroll_y + height) // row_height + 1 + self.overscan_rows)
+        column_width = width / columns
+
+        slot = 0
+        for index in range(first_row * columns, min(len(tools), last_row * columns)):
+            tool = tools[index]
+            btn = self._get_tile(slot)
+            busy = tool.name in self.launching
+            if self._tile_tools[slot] is not tool or self._tile_busy[slot] != busy:
+                btn.config(
+                    text=f"{tool.name}（启动中…）" if busy else tool.name,
+                    state=ttkb.DISABLED if busy else ttkb.NORMAL
+                )
+                self._tile_tools[slot] = tool
+                self._tile_busy[slot] = busy
+            row, col = divmod(index, columns)
+            btn.place(
+                x=int(col * column_width) + padding,
+                y=row * row_height - self._scroll_y + padding,
+                width=int(column_width) - 2 * padding,
+                height=row_height - 2 * padding
+            )
+            slot += 1
+        self._hide_tiles(slot)
+        self._visible_tiles = slot
+
+        if total_height > height:
+            self.scrollbar.set(self._scroll_y / total_height, (self._scroll_y + height) / total_height)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _scroll_to(self, y):
+        """滚动到指定像素位置"""
+        self._scroll_y = max(0, int(y))
+        self.layout()
+
+    def _on_scroll(self, action, amount, unit=None):
+        """滚动条回调（moveto / scroll）"""
+        if not self._tools:
+            return
+        total_height = math.ceil(len(self._tools) / self._columns) * self._get_row_height()
+        if action == "moveto":
+            self._scroll_to(float(amount) * total_height)
+        elif action == "scroll":
+            step = self._get_row_height() if unit == "units" else self.viewport.winfo_height()
+            self._scroll_to(self._scroll_y + int(amount) * step)
+
+    def _on_mouse_wheel(self, event):
+        """鼠标滚轮滚动"""
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        else:
+            steps = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+        self._on_scroll("scroll", steps, "units")
+        return "break"
+
+
+class LogTail:
+    """跟随读取日志文件（类似 tail -f）
+
+    记录已读取的位置，每次只读新增的字节，用增量 UTF-8 解码器解码
+    （非法字节替换为 U+FFFD，被切断的多字节字符留到下次拼接）。
+    文件变短（被截断）或换成了新文件（轮转）时从头读取。
+    同时记录每一行的起始偏移，可以按行号读取更早的内容。
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self.offset = 0
+        self._identity = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._partial = ''
+        # line_starts[i] 为第 i 行的起始偏移，最后一项为尚未结束的行的起始偏移
+        self.line_starts = array('q', [0])
+
+    @property
+    def line_count(self):
+        """已读取的完整行数"""
+        return len(self.line_starts) - 1
+
+    def reset(self):
+        """下次从文件开头读取"""
+        self.offset = 0
+        self._decoder.reset()
+        self._partial = ''
+        self.line_starts = array('q', [0])
+
+    def read(self, limit=None):
+        """读取新增的完整行，返回 (第一行的行号, 行列表, 是否从头重新读取)
+
+        limit 为返回的最多行数，更早的新增行只建立索引、不解码。
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return self.line_count, [], False
+        identity = (st.st_dev, st.st_ino)
+        restarted = False
+        if identity != self._identity or st.st_size < self.offset:
+            restarted = self._identity is not None
+            self._identity = identity
+            self.reset()
+        first = self.line_count
+        if st.st_size == self.offset:
+            return first, [], restarted
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        start = self.offset
+        self.offset += len(data)
+        self.line_starts.extend(start + m.end() for m in re.finditer(b'\n', data))
+
+        if limit is not None and self.line_count - first > limit:
+            # 换行符一定在字符边界上，可以从任意行首重新开始解码
+            first = self.line_count - limit
+            data = data[self.line_starts[first] - start:]
+            self._decoder.reset()
+            self._partial = ''
+        lines = (self._partial + self._decoder.decode(data)).split('\n')
+        # 最后一段还没有换行，等下次读取
+        self._partial = lines.pop()
+        return first, [line.rstrip('\r') for line in lines], restarted
+
+    def read_lines(self, start, end):
+        """按行号读取 [start, end) 行（翻看更早的日志）"""
+        start = max(0, start)
+        end = min(end, self.line_count)
+        if start >= end:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.line_starts[start])
+            data = f.read(self.line_starts[end] - self.line_starts[start])
+        lines = data.decode('utf-8', errors='replace').split('\n')
+        lines.pop()
+        return [line.rstrip('\r') for line in lines]
+
+
+class LogEntry:
+    """解析后的一行日志"""
+    __slots__ = ('line', 'text', 'timestamp', 'level', 'levelno', 'message', 'tool')
+    # 行首时间戳：有时间戳的行是新记录，没有的才是上一条的续行（如异常堆栈）
+    timestamp_pattern = re.compile(r'\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d(?:[,.]\d+)?')
+    # 已知的格式（时间戳之后的部分）：
+    #   - LEVEL - 消息                               本程序的格式
+    #   - 模块名 - LEVEL - 模块.函数:行号 - 消息      旧版 main2.py 等工具的格式
+    #   [LEVEL] 消息 / LEVEL 消息
+    formats = (
+        re.compile(r' - (?P<level>[A-Z]+) - (?P<message>.*)'),
+        re.compile(r' - \S+ - (?P<level>[A-Z]+) - (?:[\w.<>]+:\d+ - )?(?P<message>.*)'),
+        re.compile(r' \[?(?P<level>[A-Z]+)\]?:? (?P<message>.*)'),
+    )
+    tool_pattern = re.compile(r'工具 (\S+)')
+
+    def __init__(self, line, text, timestamp, level, message, tool):
+        self.line = line
+        self.text = text
+        self.timestamp = timestamp
+        self.level = level
+        # 未知的级别名 getLevelName 会返回字符串，按 0 处理
+        levelno = logging.getLevelName(level) if level else 0
+        self.levelno = levelno if isinstance(levelno, int) else 0
+        self.message = message
+        self.tool = tool
+
+    @classmethod
+    def parse(cls, line, text, previous=None):
+        """解析一行日志；没有时间戳的行（如异常堆栈）沿用上一条记录的时间、级别和工具"""
+        stamp = cls.timestamp_pattern.match(text)
+        if stamp is None:
+            if previous is None:
+                return cls(line, text, '', '', text, '')
+            return cls(line, text, previous.timestamp, previous.level, text, previous.tool)
+        timestamp = stamp.group()
+        rest = text[stamp.end():]
+        level, message = '', rest.lstrip(' -')
+        for fmt in cls.formats:
+            match = fmt.match(rest)
+            if match is not None:
+                level, message = match.group('level', 'message')
+                break
+        tool = cls.tool_pattern.search(message)
+        return cls(line, text, timestamp, level, message, tool.group(1) if tool else '')
+
+    def matches(self, levelno=0, tool='', text=''):
+        """是否符合过滤条件（text 需为小写）"""
+        return (self.levelno >= levelno
+                and (not tool or self.tool == tool)
+                and (not text or text in self.message.lower()))
+
+
+class LogBuffer:
+    """日志窗口的数据：最近的日志记录（有上限的环形缓冲）和整个文件的行索引"""
+    def __init__(self, path, capacity=5000, page_size=1000):
+        self.tail = LogTail(path)
+        self.records = deque(maxlen=capacity)
+        self.page_size = page_size
+
+    def refresh(self):
+        """读取新增的日志，返回 (新记录, 是否从头重新读取)"""
+        first, lines, restarted = self.tail.read(self.records.maxlen)
+        if restarted or (self.records and first > self.records[-1].line + 1):
+            self.records.clear()
+        previous = self.records[-1] if self.records else None
+        new = []
+        for i, text in enumerate(lines):
+            previous = LogEntry.parse(first + i, text, previous)
+            new.append(previous)
+        self.records.extend(new)
+        return new, restarted
+
+    def read_page(self, end):
+        """读取第 end 行之前的一页日志（行号从 0 开始）"""
+        start = max(0, end - self.page_size)
+        previous = None
+        records = []
+        for i, text in enumerate(self.tail.read_lines(start, end)):
+            previous = LogEntry.parse(start + i, text, previous)
+            records.append(previous)
+        return records
+
+    def tools(self):
+        """缓冲中出现过的工具名称"""
+        return sorted({record.tool for record in self.records if record.tool})
 
 
 class UIManager:
     """管理 UI 的类"""
-    def __init__(self, root, tool_manager, config_manager):
+    def __init__(self, root, catalog_loader):
         self.root = root
-        self.tool_manager = tool_manager
-        self.config_manager = config_manager
-        self.buttons = {}
+        # 工具目录在后台加载，完成前为 None
+        self.catalog_loader = catalog_loader
+        self.tool_manager = None
+        self.config_manager = None
+        self.config_watcher = None
+        self.menubar = None
+        self._loading_frame = None
+        self.category_buttons = {}
+        self.all_tools_button = None
         self.categories_frame = None
-        self.tools_frame = None
+        self.tools_wrapper = None
         self.current_category = None
         self.log_window = None
         self.search_var = ttkb.StringVar()
         self.sort_var = ttkb.StringVar(value="名称")
+        # 搜索防抖
+        self.search_delay = 150
+        self._search_job = None
+        # 最近打开的分类视图（LRU），切换分类时直接换入
+        self._views = OrderedDict()
+        self.current_view = None
+        # 正在启动的工具和后台启动的结果
+        self._launching = set()
+        self._launch_results = queue.Queue()
+        self._launch_job = None
+        # 窗口大小调整
+        self._pending_size = None
+        self._resize_job = None
+        self._resize_end_job = None
 
         self._setup_window()
         self._create_menu()
         self._create_main_ui()
-        self.load_tools()
+        self._show_loading()
+        self.root.after(50, self._poll_catalog)
 
     def _setup_window(self):
         """设置窗口属性"""
@@ -258,45 +2167,92 @@ class UIManager:
         self.root.geometry(f"{window_width}x{window_height}+{x_position}+{y_position}")
 
     def on_window_resize(self, event):
-        """窗口大小变化时的处理"""
-        if event.widget == self.root:
-            columns = max(2, min(6, event.width // 200))
+        """窗口大小变化时的处理（合并连续事件，停止调整后再保存窗口大小）"""
+        if event.widget != self.root:
+            return
+        if self._pending_size == (event.width, event.height):
+            return
+        self._pending_size = (event.width, event.height)
+        if self._resize_job is None:
+            self._resize_job = self.root.after_idle(self._apply_resize)
+        if self._resize_end_job is not None:
+            self.root.after_cancel(self._resize_end_job)
+        self._resize_end_job = self.root.after(500, self._on_resize_end)
+
+    def _apply_resize(self):
+        """列数变化时才重新排列工具按钮"""
+        self._resize_job = None
+        if self.config_manager is None:
+            return
+        columns = max(2, min(6, self._pending_size[0] // 200))
+        if columns != self.config_manager.get_columns():
             self.config_manager.set_columns(columns)
-            if self.current_category:
-                self.show_category(self.current_category)
+            if self.current_view:
+                self.current_view.reflow(columns)
+
+    def _on_resize_end(self):
+        """窗口大小调整结束后保存一次"""
+        self._resize_end_job = None
+        if self.config_manager is None:
+            return
+        width, height = self._pending_size
+        self.config_manager.set_window_size(width, height)
 
     def _create_menu(self):
-        """创建菜单栏"""
+        """创建菜单栏（子菜单在第一次展开时才创建菜单项）"""
         menubar = ttkb.Menu(self.root)
 
-        # 文件菜单
-        filemenu = ttkb.Menu(menubar, tearoff=0)
+        self._add_lazy_cascade(menubar, "文件", self._build_file_menu)
+        self._add_lazy_cascade(menubar, "编辑", self._build_edit_menu)
+        self._add_lazy_cascade(menubar, "设置", self._build_setting_menu)
+        self._add_lazy_cascade(menubar, "主题", self._build_theme_menu)
+        self._add_lazy_cascade(menubar, "帮助", self._build_help_menu)
+        self._add_lazy_cascade(menubar, "日志", self._build_log_menu)
+
+        # 需要工具目录的菜单在加载完成后才可用
+        for label in catalog_menus:
+            menubar.entryconfig(label, state="disabled")
+
+        self.menubar = menubar
+        self.root.config(menu=menubar)
+
+    def _add_lazy_cascade(self, parent, label, build):
+        """添加子菜单，菜单项由 build 在第一次展开时填充"""
+        menu = ttkb.Menu(parent, tearoff=0)
+
+        def populate():
+            menu.config(postcommand="")
+            build(menu)
+
+        menu.config(postcommand=populate)
+        parent.add_cascade(label=label, menu=menu)
+        return menu
+
+    def _build_file_menu(self, filemenu):
+        """文件菜单"""
         filemenu.add_command(label="打开配置文件", command=self.open_config_dialog)
         filemenu.add_command(label="退出", command=self.root.quit)
-        menubar.add_cascade(label="文件", menu=filemenu)
 
-        # 编辑菜单
-        editmenu = ttkb.Menu(menubar, tearoff=0)
+    def _build_edit_menu(self, editmenu):
+        """编辑菜单"""
         editmenu.add_command(label="添加工具", command=self.add_tool_dialog)
         editmenu.add_command(label="删除工具", command=self.remove_tool_dialog)
-        menubar.add_cascade(label="编辑", menu=editmenu)
 
-        # 设置菜单
-        settingmenu = ttkb.Menu(menubar, tearoff=0)
-        menubar.add_cascade(label="设置", menu=settingmenu)
+    def _build_setting_menu(self, settingmenu):
+        """设置菜单"""
+        self._add_lazy_cascade(settingmenu, "每行工具", self._build_columns_menu)
+        self._add_lazy_cascade(settingmenu, "窗口大小", self._build_size_menu)
 
-        # 每行工具菜单
-        columnsmenu = ttkb.Menu(menubar, tearoff=0)
-        columns = self.config_manager.get_columns()
+    def _build_columns_menu(self, columnsmenu):
+        """每行工具菜单"""
         for i in range(2, 7):
             columnsmenu.add_radiobutton(
                 label=f"每行{i}个工具",
                 command=lambda i=i: self.change_columns(i)
             )
-        settingmenu.add_cascade(label="每行工具", menu=columnsmenu)
 
-        # 窗口大小菜单
-        size_menu = ttkb.Menu(menubar, tearoff=0)
+    def _build_size_menu(self, size_menu):
+        """窗口大小菜单"""
         size_menu_map = {
             "1920x1080": (1920, 1080),
             "1600x900": (1600, 900),
@@ -312,32 +2268,27 @@ class UIManager:
         size_menu.add_command(
             label="自定义",
             command=self.custom_window_size)
-        settingmenu.add_cascade(label="窗口大小", menu=size_menu)
 
-         # 主题菜单
-        theme_menu = ttkb.Menu(menubar, tearoff=0)
+    def _build_theme_menu(self, theme_menu):
+        """主题菜单"""
         available_themes = ttkb.themes.standard.STANDARD_THEMES
         for theme in available_themes.keys():
             theme_menu.add_radiobutton(
                 label=theme,
                 command=lambda t=theme: self.change_theme(t)
             )
-        menubar.add_cascade(label="主题", menu=theme_menu)
 
-        # 帮助菜单
-        helpmenu = ttkb.Menu(menubar, tearoff=0)
+    def _build_help_menu(self, helpmenu):
+        """帮助菜单"""
         helpmenu.add_command(label="关于", command=self.show_about)
-        menubar.add_cascade(label="帮助", menu=helpmenu)
 
-        # 日志菜单
-        logmenu = ttkb.Menu(menubar, tearoff=0)
+    def _build_log_menu(self, logmenu):
+        """日志菜单"""
         logmenu.add_command(label="查看日志", command=self.show_log_window)
-        menubar.add_cascade(label="日志", menu=logmenu)
-
-        self.root.config(menu=menubar)
 
     def custom_window_size(self):
         """自定义窗口大小"""
+        from tkinter import simpledialog
         width = simpledialog.askinteger("窗口宽度", "请输入窗口宽度:", minvalue=800, maxvalue=3840)
         height = simpledialog.askinteger("窗口高度", "请输入窗口高度:", minvalue=600, maxvalue=2160)
         if width and height:
@@ -346,13 +2297,16 @@ class UIManager:
     def change_columns(self, columns):
         """改变每行工具数量"""
         self.config_manager.set_columns(columns)
-        if self.current_category:
-            self.show_category(self.current_category)
+        if self.current_view:
+            self.current_view.reflow(columns)
     
     def change_theme(self, theme_name):
         """切换主题"""
         self.root.style.theme_use(theme_name)
         self.config_manager.set_theme(theme_name)
+        # 主题会改变按钮高度，重新测量行高
+        for view in self._views.values():
+            view.reset_row_height()
 
     def _create_main_ui(self):
         """创建主界面"""
@@ -379,7 +2333,7 @@ class UIManager:
         ttkb.Label(search_sort_frame, text="搜索:").pack(side=ttkb.LEFT, padx=(0, 5))
         search_entry = ttkb.Entry(search_sort_frame, textvariable=self.search_var)
         search_entry.pack(side=ttkb.LEFT, fill=ttkb.X, expand=True, padx=(0, 5))
-        self.search_var.trace_add("write", self.filter_tools)
+        self.search_var.trace_add("write", self._on_search_changed)
 
         ttkb.Label(search_sort_frame, text="排序:").pack(side=ttkb.LEFT, padx=(0, 5))
         sort_combo = ttkb.Combobox(search_sort_frame, textvariable=self.sort_var, values=["名称", "类型", "描述"], state="readonly", width=10)
@@ -392,50 +2346,146 @@ class UIManager:
         self.tools_count = ttkb.Label(right_frame, text="")
         self.tools_count.pack(anchor=ttkb.W, pady=(0, 10))
 
-        # 工具列表（带滚动条）
-        tools_wrapper = ttkb.Frame(right_frame)
-        tools_wrapper.pack(fill=ttkb.BOTH, expand=True)
-
-        scrollbar = ttkb.Scrollbar(tools_wrapper)
-        scrollbar.pack(side=ttkb.RIGHT, fill=ttkb.Y)
+        # 工具列表（每个分类一个带滚动条的视图）
+        self.tools_wrapper = ttkb.Frame(right_frame)
+        self.tools_wrapper.pack(fill=ttkb.BOTH, expand=True)
+
+    def _show_loading(self):
+        """工具目录加载期间显示的占位界面"""
+        ttkb.Label(self.categories_frame, text="正在加载…").pack(anchor=ttkb.W, padx=5, pady=2)
+        self.category_title.config(text="所有工具")
+        self.tools_count.config(text="正在加载工具目录…")
+        self._loading_frame = ttkb.Frame(self.tools_wrapper)
+        self._loading_frame.pack(fill=ttkb.X, pady=20)
+        progress = ttkb.Progressbar(self._loading_frame, mode="indeterminate", length=300)
+        progress.pack()
+        progress.start(15)
+
+    def _poll_catalog(self):
+        """等待后台加载的工具目录"""
+        result = self.catalog_loader.poll()
+        if result is None:
+            self.root.after(50, self._poll_catalog)
+            return
+        if isinstance(result, Exception):
+            messagebox.showerror("错误", f"加载配置文件时出错: {result}")
+            self.root.quit()
+            return
+        self._on_catalog_loaded(*result)
 
-        self.tools_canvas = ttkb.Canvas(tools_wrapper, yscrollcommand=scrollbar.set)
-        self.tools_canvas.pack(side=ttkb.LEFT, fill=ttkb.BOTH, expand=True)
-        scrollbar.config(command=self.tools_canvas.yview)
+    def _on_catalog_loaded(self, config_manager, tool_manager):
+        """工具目录加载完成：显示分类和工具，启用菜单"""
+        self.config_manager = config_manager
+        self.tool_manager = tool_manager
+        self._loading_frame.destroy()
+        self._loading_frame = None
+        for label in catalog_menus:
+            self.menubar.entryconfig(label, state="normal")
 
-        self.tools_frame = ttkb.Frame(self.tools_canvas)
-        self.tools_canvas.create_window((0, 0), window=self.tools_frame, anchor="nw")
-        self.tools_frame.bind("<Configure>", lambda e: self.tools_canvas.configure(scrollregion=self.tools_canvas.bbox("all")))
+        self.load_tools()
+        self.tool_manager.add_listener(self._on_tools_changed)
+        self.root.after(100, self._poll_packs)
+        self.config_watcher = ConfigWatcher(config_manager)
+        self.config_watcher.start()
+        self.root.after(500, self._poll_config_changes)
+
+        # 加载期间的窗口大小变化
+        if self._pending_size is not None:
+            self._apply_resize()
+            if self._resize_end_job is None:
+                self._on_resize_end()
 
     def load_tools(self):
         """加载工具到 UI"""
-        categories = self.tool_manager.get_categories()
+        categories = self.tool_manager.get_category_names()
 
         for widget in self.categories_frame.winfo_children():
             widget.destroy()
+        self.category_buttons = {}
 
         # 添加“所有工具”分类
-        all_tools_btn = ttkb.Button(
+        self.all_tools_button = ttkb.Button(
             self.categories_frame,
             text="所有工具",
             width=20,
             command=lambda: self.show_category("所有工具")
         )
-        all_tools_btn.pack(fill=ttkb.X, padx=5, pady=2)
+        self.all_tools_button.pack(fill=ttkb.X, padx=5, pady=2)
 
-        for category in categories:
-            btn = ttkb.Button(
-                self.categories_frame,
-                text=category,
-                width=20,
-                command=lambda c=category: self.show_category(c)
-            )
-            btn.pack(fill=ttkb.X, padx=5, pady=2)
+        self._sync_category_buttons()
 
-        # 显示第一个分类的工具
+        # 显示第一个分类的工具（空闲时再显示，先让窗口和分类列表画出来）
         if categories:
             first_category = "所有工具"
-            self.show_category(first_category)
+            self.root.after_idle(self.show_category, first_category)
+
+    def _sync_category_buttons(self, changed=None):
+        """只增删发生变化的分类按钮，并更新分类的工具数量
+
+        changed 为受影响的分类，为 None 时更新全部分类的数量。
+        """
+        names = self.tool_manager.get_category_names()
+        existing = set(names)
+        for category in list(self.category_buttons):
+            if category not in existing:
+                self.category_buttons.pop(category).destroy()
+
+        # 新分类按钮插入到下一个已有分类按钮之前，保持分类顺序
+        next_btn = None
+        for category in reversed(names):
+            btn = self.category_buttons.get(category)
+            if btn is None:
+                btn = ttkb.Button(
+                    self.categories_frame,
+                    width=20,
+                    command=lambda c=category: self.show_category(c)
+                )
+                if next_btn is None:
+                    btn.pack(fill=ttkb.X, padx=5, pady=2)
+                else:
+                    btn.pack(fill=ttkb.X, padx=5, pady=2, before=next_btn)
+                self.category_buttons[category] = btn
+                if changed is not None:
+                    changed.add(category)
+            next_btn = btn
+
+        counts = self.tool_manager.get_category_counts()
+        for category in (names if changed is None else changed):
+            btn = self.category_buttons.get(category)
+            if btn is not None:
+                btn.config(text=f"{category} ({counts[category]})")
+        self.all_tools_button.config(text=f"所有工具 ({sum(counts.values())})")
+
+    def _on_tools_changed(self, changes):
+        """工具增删改后只更新受影响的分类按钮和当前视图"""
+        categories = changes.categories()
+        self._sync_category_buttons(set(categories))
+        if self.current_category == "所有工具" or self.current_category in categories:
+            self.show_category(self.current_category)
+
+    def _poll_packs(self):
+        """加入后台解析好的 conf.d 分类（每次轮询合并为一次通知）"""
+        done = self.catalog_loader.packs_done.is_set()
+        parsed = self.catalog_loader.poll_packs()
+        if parsed:
+            self.tool_manager.install_categories(parsed)
+        if not done:
+            self.root.after(100, self._poll_packs)
+
+    def _poll_config_changes(self):
+        """处理后台监视到的配置文件修改"""
+        for reloaded in self.config_watcher.poll():
+            changes = self.tool_manager.apply_reload(reloaded)
+            if not changes:
+                continue
+            logging.info(
+                f"配置文件已重新加载: 新增 {len(changes.added)}，删除 {len(changes.removed)}，"
+                f"修改 {len(changes.changed)}"
+            )
+            # 工具的变化已经通过 _on_tools_changed 更新
+            if 'set' in changes.settings:
+                self.show_category(self.current_category)
+        self.root.after(500, self._poll_config_changes)
 
     def show_category(self, category):
         """显示指定分类的工具"""
@@ -443,95 +2493,118 @@ class UIManager:
         tools = []
 
         if category == "所有工具":
-            tools = self.config_manager.get_all_tools()
+            tools = self.tool_manager.get_all_tools()
         else:
-            tools = self.tool_manager.get_categories().get(category, [])
+            tools = self.tool_manager.get_category_tools(category)
 
+        count = self.tool_manager.get_category_count(category)
         self.category_title.config(text=category)
-        self.tools_count.config(text=f"工具数量: {len(tools)}")
-
-        for widget in self.tools_frame.winfo_children():
-            widget.destroy()
+        self.tools_count.config(text=f"工具数量: {count}")
 
+        view = self._activate_view(category)
         if not tools:
-            ttkb.Label(self.tools_frame, text="该分类下没有工具").pack(pady=20)
+            view.key = None
+            view.show_empty("正在加载工具…" if count else "该分类下没有工具")
             return
 
         self.filter_tools()
 
+    def _activate_view(self, category):
+        """换入分类视图（缓存中没有时创建），超出数量的旧视图被释放"""
+        view = self._views.pop(category, None)
+        if view is None:
+            view = ToolGridView(self.tools_wrapper, self.run_tool, self.show_context_menu, self._launching)
+        self._views[category] = view
+        if self.current_view is not view:
+            if self.current_view is not None:
+                self.current_view.pack_forget()
+            view.pack()
+            self.current_view = view
+        while len(self._views) > self.config_manager.get_view_cache_size():
+            _, old_view = self._views.popitem(last=False)
+            old_view.destroy()
+        return view
+
+    def _on_search_changed(self, *args):
+        """搜索框内容变化：合并连续输入，停顿后再过滤"""
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(self.search_delay, self.filter_tools)
+
     def filter_tools(self, *args):
         """根据搜索和排序条件过滤工具"""
-        if not self.current_category:
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+            self._search_job = None
+        if not self.current_category or self.current_view is None:
             return
 
-        tools = []
-        if self.current_category == "所有工具":
-            tools = self.config_manager.get_all_tools()
-        else:
-            tools = self.tool_manager.get_categories().get(self.current_category, [])
-
-        search_term = self.search_var.get().lower()
+        search_term = self.search_var.get()
         sort_by = self.sort_var.get()
+        columns = self.config_manager.get_columns()
+        view = self.current_view
 
-        # 过滤工具
-        filtered_tools = [
-            tool for tool in tools
-            if (search_term in tool['name'].lower() or
-                search_term in tool['type'].lower() or
-                search_term in tool['description'].lower())
-        ]
+        # 视图内容仍然有效时只按当前列数重新排列
+        key = (search_term, sort_by, self.tool_manager.get_category_version(self.current_category))
+        if view.key == key:
+            view.reflow(columns)
+            return
+        # 只是分类中的工具有变化时保持滚动位置
+        keep_position = view.key is not None and view.key[:2] == key[:2]
+        view.key = key
 
-        # 排序工具
-        if sort_by == "名称":
-            filtered_tools.sort(key=lambda x: x['name'])
-        elif sort_by == "类型":
-            filtered_tools.sort(key=lambda x: x['type'])
-        elif sort_by == "描述":
-            filtered_tools.sort(key=lambda x: x['description'])
+        # 过滤并排序工具
+        filtered_tools = self.tool_manager.search_tools(self.current_category, search_term, sort_by)
 
         # 显示过滤后的工具
-        for widget in self.tools_frame.winfo_children():
-            widget.destroy()
-
+        view.cancel_layout()
         if not filtered_tools:
-            ttkb.Label(self.tools_frame, text="没有匹配的工具").pack(pady=20)
+            view.show_empty("没有匹配的工具")
             return
 
-        columns = self.config_manager.get_columns()
-        self._create_tool_buttons(filtered_tools, columns)
-
-    def _create_tool_buttons(self, tools, columns):
-        """创建工具按钮"""
-        row, col = 0, 0
-        for tool in tools:
-            btn = ttkb.Button(
-                self.tools_frame,
-                text=tool['name'],
-                command=lambda t=tool: self.run_tool(t),
-                width=20
-            )
-            btn.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-            self.tools_frame.grid_columnconfigure(col, weight=1)
-            
-            # 右键菜单
-            btn.bind("<Button-3>", lambda event, t=tool: self.show_context_menu(event, t))
-
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
+        view.show_tools(filtered_tools, columns, keep_position)
 
     def show_context_menu(self, event, tool):
         """显示右键菜单"""
         context_menu = ttkb.Menu(self.root, tearoff=0)
         context_menu.add_command(label="工具详情", command=lambda: self.show_tool_details(tool))
         context_menu.add_command(label="打开文件所在位置", command=lambda: self.open_file_location(tool))
+        context_menu.add_command(label="运行记录", command=lambda: self.show_launch_history(tool))
         context_menu.post(event.x_root, event.y_root)
 
+    def show_launch_history(self, tool, limit=50):
+        """显示工具最近的启动记录"""
+        launches = self.tool_manager.get_recent_launches(tool.name, limit)
+
+        history_window = ttkb.Toplevel(self.root)
+        history_window.title(f"运行记录: {tool.name}")
+        history_window.transient(self.root)
+        self._center_window(history_window, 700, 400)
+
+        columns = ("时间", "结果", "进程号", "启动耗时(ms)", "命令")
+        tree = ttkb.Treeview(history_window, columns=columns, show="headings")
+        for column, width in zip(columns, (170, 70, 70, 90, 300)):
+            tree.heading(column, text=column)
+            tree.column(column, width=width, stretch=(column == "命令"))
+        tree.pack(fill=ttkb.BOTH, expand=True, padx=10, pady=10)
+
+        for launch in launches:
+            argv = launch.get('argv') or []
+            tree.insert("", ttkb.END, values=(
+                launch.get('time', ''),
+                launch.get('outcome', ''),
+                launch.get('pid') or '',
+                launch.get('latency_ms') or '',
+                ' '.join(argv)
+            ))
+
+        ttkb.Label(history_window, text=f"最近 {len(launches)} 次启动").pack(side=ttkb.LEFT, padx=10, pady=(0, 10))
+        ttkb.Button(history_window, text="关闭", command=history_window.destroy).pack(side=ttkb.RIGHT, padx=10, pady=(0, 10))
+
     def show_tool_details(self, tool):
         """显示工具详情"""
         details_window = ttkb.Toplevel(self.root)
-        details_window.title(f"工具详情: {tool['name']}")
+        details_window.title(f"工具详情: {tool.name}")
         details_window.geometry("400x500")
         details_window.resizable(False, False)
         details_window.transient(self.root)
@@ -542,13 +2615,13 @@ class UIManager:
 
         # 创建表单元素
         fields = [
-            ("工具名称", tool['name']),
-            ("分类", tool['category']),
-            ("路径", tool['path']),
-            ("类型", tool['type']),
-            ("环境变量", tool['env']),
-            ("参数", tool['args']),
-            ("描述", tool['description'])
+            ("工具名称", tool.name),
+            ("分类", tool.category),
+            ("路径", tool.path),
+            ("类型", tool.type),
+            ("环境变量", tool.env),
+            ("参数", tool.args),
+            ("描述", tool.description)
         ]
 
         for i, (label, value) in enumerate(fields):
@@ -573,7 +2646,7 @@ class UIManager:
 
     def open_file_location(self, tool):
         """打开文件所在位置"""
-        file_path = Path(tool['path'])
+        file_path = Path(tool.path)
         if not file_path.exists():
             messagebox.showerror("错误", f"文件路径 {file_path} 不存在")
             return
@@ -582,21 +2655,54 @@ class UIManager:
             if os.name == 'nt':
                 os.startfile(file_path.parent)
             else:
+                import subprocess
                 subprocess.Popen(['xdg-open', str(file_path.parent)])
         except Exception as e:
             messagebox.showerror("错误", f"打开文件位置时出错: {e}")
             logging.error(f"打开文件位置时出错: {e}")
 
     def run_tool(self, tool):
-        """运行工具"""
-        try:
-            self.tool_manager.run_tool(tool)
-        except Exception as e:
-            messagebox.showerror("错误", f"运行工具时出错: {e}")
-            logging.error(f"运行工具时出错: {e}")
+        """运行工具（后台启动，按钮显示启动中，直到进程创建完成）"""
+        if tool.name in self._launching:
+            return None
+        future = self.tool_manager.submit_tool(tool)
+        self._launching.add(tool.name)
+        self._refresh_tiles()
+        # 完成回调在后台线程中执行，只把结果放入队列，由界面线程处理
+        future.add_done_callback(lambda f: self._launch_results.put((tool, f)))
+        if self._launch_job is None:
+            self._launch_job = self.root.after(50, self._poll_launches)
+        return future
+
+    def _poll_launches(self):
+        """处理已完成的启动"""
+        self._launch_job = None
+        while True:
+            try:
+                tool, future = self._launch_results.get_nowait()
+            except queue.Empty:
+                break
+            self._launching.discard(tool.name)
+            self._refresh_tiles()
+            error = future.exception()
+            if error is not None:
+                messagebox.showerror("错误", f"运行工具时出错: {error}")
+                logging.error(f"运行工具时出错: {error}")
+                continue
+            launch = future.result()
+            if launch.get('error'):
+                messagebox.showerror("错误", launch['error'])
+        if self._launching:
+            self._launch_job = self.root.after(50, self._poll_launches)
+
+    def _refresh_tiles(self):
+        """重新绘制按钮（启动状态变化）"""
+        for view in self._views.values():
+            view.schedule_layout()
 
     def open_config_dialog(self):
         """打开配置文件对话框"""
+        from tkinter import filedialog
         file_path = filedialog.askopenfilename(
             title="选择配置文件",
             filetypes=[("配置文件", "*.ini")]
@@ -634,7 +2740,7 @@ class UIManager:
             if label == "路径":
                 ttkb.Button(dialog, text="浏览", command=lambda var=var: self.browse_file(var)).grid(row=i, column=2, padx=5, pady=5)
             if label == "分类":
-                categories = list(self.tool_manager.get_categories().keys())
+                categories = self.tool_manager.get_category_names()
                 entry = ttkb.Combobox(dialog, textvariable=var, values=categories)
                 entry.grid(row=i, column=1, padx=10, pady=5, sticky=ttkb.W+ttkb.E)
             if label == "类型":
@@ -656,6 +2762,7 @@ class UIManager:
 
     def browse_file(self, var):
         """文件浏览对话框"""
+        from tkinter import filedialog
         file_path = filedialog.askopenfilename()
         if file_path:
             var.set(file_path)
@@ -685,7 +2792,6 @@ class UIManager:
             data["描述"]
         )
 
-        self.load_tools()
         dialog.destroy()
         messagebox.showinfo("成功", f"工具 {data['工具名称']} 已添加")
 
@@ -697,9 +2803,9 @@ class UIManager:
 
         tools = []
         if self.current_category == "所有工具":
-            tools = self.config_manager.get_all_tools()
+            tools = self.tool_manager.get_all_tools()
         else:
-            tools = self.tool_manager.get_categories().get(self.current_category, [])
+            tools = self.tool_manager.get_category_tools(self.current_category)
 
         if not tools:
             messagebox.showerror("错误", "当前分类下没有工具")
@@ -720,7 +2826,7 @@ class UIManager:
         listbox.pack(padx=10, pady=10, fill=ttkb.BOTH, expand=True)
 
         for tool in tools:
-            listbox.insert(ttkb.END, f"{tool['name']} - {tool['description']}")
+            listbox.insert(ttkb.END, f"{tool.name} - {tool.description}")
 
         def delete_selected():
             selected_index = listbox.curselection()
@@ -729,11 +2835,10 @@ class UIManager:
                 return
 
             tool = tools[selected_index[0]]
-            if messagebox.askyesno("确认", f"确定要删除工具 {tool['name']} 吗?"):
-                self.tool_manager.remove_tool(tool['name'])
-                self.load_tools()
+            if messagebox.askyesno("确认", f"确定要删除工具 {tool.name} 吗?"):
+                self.tool_manager.remove_tool(tool.name)
                 dialog.destroy()
-                messagebox.showinfo("成功", f"工具 {tool['name']} 已删除")
+                messagebox.showinfo("成功", f"工具 {tool.name} 已删除")
 
         ttkb.Button(dialog, text="删除", command=delete_selected).pack(side=ttkb.LEFT, padx=5)
         ttkb.Button(dialog, text="取消", command=dialog.destroy).pack(side=ttkb.LEFT, padx=5)
@@ -757,6 +2862,29 @@ class UIManager:
         self.log_window.title("运行日志")
         self._center_window(self.log_window, 800, 600)
 
+        # 过滤条件
+        filter_frame = ttkb.Frame(self.log_window)
+        filter_frame.pack(fill=ttkb.X, padx=10, pady=(10, 0))
+
+        self.log_level_var = ttkb.StringVar(value="全部")
+        self.log_tool_var = ttkb.StringVar(value="全部")
+        self.log_search_var = ttkb.StringVar()
+
+        ttkb.Label(filter_frame, text="级别:").pack(side=ttkb.LEFT, padx=(0, 5))
+        level_combo = ttkb.Combobox(filter_frame, textvariable=self.log_level_var, values=["全部", "INFO", "WARNING", "ERROR"], state="readonly", width=10)
+        level_combo.pack(side=ttkb.LEFT, padx=(0, 10))
+        level_combo.bind("<<ComboboxSelected>>", lambda e: self.render_logs())
+
+        ttkb.Label(filter_frame, text="工具:").pack(side=ttkb.LEFT, padx=(0, 5))
+        tool_combo = ttkb.Combobox(filter_frame, textvariable=self.log_tool_var, state="readonly", width=20)
+        tool_combo.configure(postcommand=lambda: tool_combo.configure(values=["全部"] + self._log_buffer.tools()))
+        tool_combo.pack(side=ttkb.LEFT, padx=(0, 10))
+        tool_combo.bind("<<ComboboxSelected>>", lambda e: self.render_logs())
+
+        ttkb.Label(filter_frame, text="搜索:").pack(side=ttkb.LEFT, padx=(0, 5))
+        ttkb.Entry(filter_frame, textvariable=self.log_search_var).pack(side=ttkb.LEFT, fill=ttkb.X, expand=True)
+        self.log_search_var.trace_add("write", lambda *args: self.render_logs())
+
         # 日志内容区域
         log_frame = ttkb.Frame(self.log_window)
         log_frame.pack(fill=ttkb.BOTH, expand=True, padx=10, pady=10)
@@ -764,7 +2892,7 @@ class UIManager:
         scrollbar = ttkb.Scrollbar(log_frame)
         scrollbar.pack(side=ttkb.RIGHT, fill=ttkb.Y)
 
-        self.log_text = ttkb.Text(log_frame, wrap=ttkb.WORD, state=ttkb.DISABLED)
+        self.log_text = ttkb.Text(log_frame, wrap=ttkb.WORD, state=ttkb.DISABLED, yscrollcommand=scrollbar.set)
         self.log_text.pack(side=ttkb.LEFT, fill=ttkb.BOTH, expand=True)
         scrollbar.config(command=self.log_text.yview)
 
@@ -772,30 +2900,108 @@ class UIManager:
         button_frame = ttkb.Frame(self.log_window)
         button_frame.pack(fill=ttkb.X, pady=5)
 
-        current_dir = Path(sys.argv[0]).parent.resolve()
-        log_file = current_dir / 'log/app.log'
-
         ttkb.Button(button_frame, text="刷新", command=self.refresh_logs).pack(side=ttkb.LEFT, padx=5)
+        ttkb.Button(button_frame, text="更早", command=self.show_older_logs).pack(side=ttkb.LEFT, padx=5)
+        ttkb.Button(button_frame, text="最新", command=self.show_latest_logs).pack(side=ttkb.LEFT, padx=5)
+        self.log_status = ttkb.Label(button_frame, text="")
+        self.log_status.pack(side=ttkb.LEFT, padx=5)
         ttkb.Button(button_frame, text="关闭", command=self.log_window.destroy).pack(side=ttkb.RIGHT, padx=5)
-        ttkb.Button(button_frame, text="清空日志", command=lambda: self.log_text.config(state=ttkb.NORMAL, text="")).pack(side=ttkb.RIGHT, padx=5)
+        ttkb.Button(button_frame, text="清空日志", command=self.clear_log_view).pack(side=ttkb.RIGHT, padx=5)
         ttkb.Button(button_frame, text="打开日志文件", command=lambda: os.startfile(log_file)).pack(side=ttkb.RIGHT, padx=5)
 
-        # 自动刷新日志
+        # 最近的日志保存在有上限的缓冲中，自动刷新时只追加新增的内容
+        self._log_buffer = LogBuffer(log_file)
+        # 正在翻看的更早日志（None 表示显示最新的日志）
+        self._log_page = None
         self.refresh_logs()
         self.log_window.after(1000, self.auto_refresh_logs)
 
+    def _log_filter(self):
+        """当前的过滤条件 (最低级别, 工具, 小写搜索词)"""
+        level = self.log_level_var.get()
+        tool = self.log_tool_var.get()
+        return (
+            0 if level == "全部" else logging.getLevelName(level),
+            '' if tool == "全部" else tool,
+            self.log_search_var.get().lower()
+        )
+
+    def _write_logs(self, records, replace=False):
+        """把符合过滤条件的记录写入日志窗口"""
+        levelno, tool, text = self._log_filter()
+        lines = [record.text for record in records if record.matches(levelno, tool, text)]
+        if not lines and not replace:
+            return
+
+        # 原来就在末尾时继续跟随新内容，否则保持用户正在看的位置
+        at_end = replace or self.log_text.yview()[1] >= 1.0
+        self.log_text.config(state=ttkb.NORMAL)
+        if replace:
+            self.log_text.delete(1.0, ttkb.END)
+        if lines:
+            self.log_text.insert(ttkb.END, '\n'.join(lines) + '\n')
+        self.log_text.config(state=ttkb.DISABLED)
+        if at_end:
+            self.log_text.see(ttkb.END)
+
+    def _update_log_status(self):
+        """显示当前显示的行范围"""
+        total = self._log_buffer.tail.line_count
+        records = self._log_page if self._log_page is not None else self._log_buffer.records
+        if records:
+            self.log_status.config(text=f"第 {records[0].line + 1}-{records[-1].line + 1} 行，共 {total} 行")
+        else:
+            self.log_status.config(text=f"共 {total} 行")
+
+    def render_logs(self):
+        """按过滤条件重新显示日志（只在缓冲或当前页中过滤）"""
+        records = self._log_page if self._log_page is not None else self._log_buffer.records
+        self._write_logs(records, replace=True)
+        self._update_log_status()
+
     def refresh_logs(self):
-        """刷新日志内容"""
+        """读取日志新增的内容，显示最新日志时追加到窗口"""
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                log_content = f.read()
-            self.log_text.config(state=ttkb.NORMAL)
-            self.log_text.delete(1.0, ttkb.END)
-            self.log_text.insert(ttkb.END, log_content)
-            self.log_text.config(state=ttkb.DISABLED)
-        except Exception as e:
+            records, restarted = self._log_buffer.refresh()
+        except OSError as e:
             messagebox.showerror("错误", f"刷新日志时出错: {e}")
             logging.error(f"刷新日志时出错: {e}")
+            return
+        if self._log_page is not None:
+            if restarted:
+                self.show_latest_logs()
+            return
+        if restarted:
+            self.render_logs()
+        elif records:
+            self._write_logs(records)
+            self._update_log_status()
+
+    def show_older_logs(self):
+        """按行索引从文件中读取更早的一页日志"""
+        records = self._log_page if self._log_page is not None else self._log_buffer.records
+        end = records[0].line if records else self._log_buffer.tail.line_count
+        if end <= 0:
+            return
+        try:
+            self._log_page = self._log_buffer.read_page(end)
+        except OSError as e:
+            messagebox.showerror("错误", f"读取日志时出错: {e}")
+            logging.error(f"读取日志时出错: {e}")
+            return
+        self.render_logs()
+        self.log_text.see(1.0)
+
+    def show_latest_logs(self):
+        """回到最新的日志"""
+        self._log_page = None
+        self.render_logs()
+
+    def clear_log_view(self):
+        """清空日志窗口（不修改日志文件），之后只显示新的日志"""
+        self._log_buffer.records.clear()
+        self._log_page = None
+        self.render_logs()
 
     def auto_refresh_logs(self):
         """自动刷新日志"""
@@ -803,21 +3009,125 @@ class UIManager:
             self.refresh_logs()
             self.log_window.after(1000, self.auto_refresh_logs)
 
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """按大小或按天轮转的日志文件
+
+    归档文件用 gzip 压缩（app.log.1.gz 为最近的一个），最多保留 backupCount 个。
+    """
+    def __init__(self, filename, maxBytes, backupCount):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding='utf-8')
+        # 已有的日志文件按最后修改的日期计算下一次轮转时间
+        try:
+            start = os.path.getmtime(self.baseFilename)
+        except OSError:
+            start = time.time()
+        self.rollover_at = self._next_midnight(start)
+
+    @staticmethod
+    def _next_midnight(timestamp):
+        """timestamp 之后的第一个零点"""
+        day = datetime.date.fromtimestamp(timestamp) + datetime.timedelta(days=1)
+        return time.mktime(day.timetuple())
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.stream.tell() > 0:
+                return True
+            self.rollover_at = self._next_midnight(time.time())
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_midnight(time.time())
+
+    def rotation_filename(self, default_name):
+        return default_name + '.gz'
+
+    def rotate(self, source, dest):
+        """压缩归档当前日志文件"""
+        with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+
+def setup_logging():
+    """配置日志
+
+    日志记录先放入队列，由 QueueListener 的后台线程写入文件和控制台，
+    界面线程记录日志时不做磁盘 I/O。
+    """
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [CompressingRotatingFileHandler(log_file, log_max_bytes, log_backup_count)]
+    # 无控制台（pythonw / pyinstaller -w）时没有 stderr
+    if sys.stderr is not None:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    # 退出时写完队列中剩余的日志（最先注册，最后执行）
+    atexit.register(listener.stop)
+    return listener
+
+
+class StartupTrace:
+    """启动耗时记录（--startup-trace 时输出到日志）"""
+    def __init__(self, enabled, start=None):
+        self.enabled = enabled
+        self.start = self.last = start if start is not None else time.perf_counter()
+        self.marks = []
+
+    def mark(self, label):
+        """记录上一步到现在的耗时"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.marks.append((label, now - self.last, now - self.start))
+        self.last = now
+
+    def report(self):
+        """输出各步骤耗时"""
+        for label, step, total in self.marks:
+            logging.info(f"启动耗时 {label}: {step * 1000:.1f} ms（累计 {total * 1000:.1f} ms）")
+
+
 def main():
+    setup_logging()
+    trace = StartupTrace('--startup-trace' in sys.argv[1:], startup_time)
+    trace.mark("导入模块")
     current_dir = Path(sys.argv[0]).parent.resolve()
     config_path = current_dir / 'config.ini'
 
-    log_file = current_dir / 'log/app.log'
-    log_dir = current_dir / 'log'
-    log_dir.mkdir(parents=True, exist_ok=True)
-
-    config_manager = ConfigManager(config_path)
-    environment_manager = EnvironmentManager(config_manager)
-    tool_manager = ToolManager(config_manager, environment_manager)
+    # 工具目录在后台线程中加载，窗口先显示出来
+    catalog_loader = CatalogLoader(config_path)
+    catalog_loader.start()
+    theme = ConfigManager.peek_setting(config_path, 'set', 'theme', default_theme)
+    trace.mark("启动加载线程")
     # root = ttkb.ttkb()
-    root = ttkb.Window(title="渗透测试工具箱", themename=config_manager.get_theme())
-    ui_manager = UIManager(root, tool_manager, config_manager)
+    root = ttkb.Window(title="渗透测试工具箱", themename=theme)
+    trace.mark("创建窗口")
+    ui_manager = UIManager(root, catalog_loader)
+    trace.mark("创建界面")
+    if trace.enabled:
+        def report_startup():
+            root.update_idletasks()
+            trace.mark("首次显示")
+            trace.report()
+        root.after_idle(report_startup)
     root.mainloop()
+    if ui_manager.config_watcher:
+        ui_manager.config_watcher.stop()
+    if ui_manager.config_manager:
+        ui_manager.config_manager.flush()
+        ui_manager.config_manager.save_snapshot()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""性能测试脚本共用的工具：加载主程序模块、生成合成的工具配置、计时"""
+import importlib.util
+import random
+import statistics
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 合成描述用的词（中英文混合，接近真实工具描述）
+WORDS = (
+    "扫描", "漏洞", "利用", "框架", "信息收集", "端口", "爆破", "webshell", "管理", "内网",
+    "代理", "隧道", "spring", "weblogic", "struts2", "shiro", "fastjson", "fscan", "nmap",
+    "sqlmap", "burp", "dirsearch", "子域名", "指纹", "识别", "反序列化", "命令执行", "提权",
+)
+TYPES = ("exe", "cmd", "py", "jar", "jcmd", "bat")
+
+
+def load_app():
+    """加载 4_main_theme_dev.py（文件名以数字开头，不能直接 import）"""
+    spec = importlib.util.spec_from_file_location("main_theme_dev", ROOT / "4_main_theme_dev.py")
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+
+def make_tools(count, seed=0):
+    """生成 count 个工具配置 [(名称, {键: 值})]，描述约 200 个字符"""
+    rng = random.Random(seed)
+    tools = []
+    for i in range(count):
+        words = []
+        while sum(map(len, words)) < 200:
+            words.append(rng.choice(WORDS))
+        tools.append((f"tool{i}", {
+            'category': f"分类{i % 30}",
+            'path': f"tools/tool{i}/tool{i}.exe",
+            'type': TYPES[i % len(TYPES)],
+            'env': '',
+            'args': '',
+            'description': ' '.join(words),
+        }))
+    return tools
+
+
+def write_config(path, count, seed=0):
+    """写入包含 count 个工具的 config.ini"""
+    lines = ["[set]\n", "columns = 5\n", "\n"]
+    for name, values in make_tools(count, seed):
+        lines.append(f"[{name}]\n")
+        lines.extend(f"{key} = {value}\n" for key, value in values.items())
+        lines.append("\n")
+    Path(path).write_text(''.join(lines), encoding='utf-8')
+
+
+def median_ms(func, repeat, setup=None):
+    """func 多次运行耗时的中位数（毫秒），setup 在每次计时前调用"""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs)
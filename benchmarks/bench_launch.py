@@ -0,0 +1,55 @@
+"""创建进程的耗时：经过 shell 的命令行与直接传入 argv 的对比（仅 Linux / macOS）
+
+    python3 benchmarks/bench_launch.py [次数]
+"""
+import logging
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import load_app
+
+
+def measure(spawn, repeat):
+    """返回 (Popen 返回耗时, 到进程结束的耗时) 的中位数（毫秒）"""
+    popen, total = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = spawn()
+        popen.append((time.perf_counter() - start) * 1000)
+        process.wait()
+        total.append((time.perf_counter() - start) * 1000)
+    return statistics.median(popen), statistics.median(total)
+
+
+def main():
+    if os.name == 'nt':
+        sys.exit("只支持 Linux / macOS")
+    logging.disable(logging.CRITICAL)
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = load_app()
+    backend = app.LinuxBackend()
+    true = '/bin/true' if os.path.exists('/bin/true') else '/usr/bin/true'
+    argv = [true, '-a', 'b c']
+    with tempfile.TemporaryDirectory() as cwd:
+        spec = app.LaunchSpec(argv, cwd, None, False)
+        cases = (
+            # 改进之前的方式：sh -c 'cd ... && ...'
+            ("shell=True, sh -c 'cd ... && ...'",
+             lambda: subprocess.Popen(f"cd {shlex.quote(cwd)} && {shlex.join(argv)}", shell=True)),
+            ("argv + cwd=, shell=False", lambda: subprocess.Popen(argv, cwd=cwd)),
+            ("argv，不指定 cwd（posix_spawn）", lambda: subprocess.Popen(argv)),
+            ("LinuxBackend.spawn(LaunchSpec)", lambda: backend.spawn(spec)[0]),
+        )
+        print(f"Python {sys.version.split()[0]}，{true} 两个参数，{repeat} 次的中位数")
+        for name, spawn in cases:
+            popen, total = measure(spawn, repeat)
+            print(f"  {name:<36} Popen {popen:.3f} ms，到进程结束 {total:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""搜索性能：倒排索引与逐个子串匹配的对比，以及目录加载后第一次输入搜索词的耗时
+
+    python3 benchmarks/bench_search.py
+"""
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from _common import load_app, make_tools, median_ms, write_config
+
+QUERIES = ("扫", "漏洞", "fscan", "spring漏", "tool99", "利用框架", "xyz")
+SIZES = (100, 1000, 10000)
+
+
+def bench_index(app, count):
+    tools = [app.Tool.from_section(name, values) for name, values in make_tools(count)]
+
+    def build():
+        index = app.SearchIndex()
+        for tool in tools:
+            index.add(tool)
+        return index
+
+    index = build()
+    texts = {tool.name: app.SearchIndex._tool_text(tool) for tool in tools}
+    for query in QUERIES:
+        linear = {name for name, text in texts.items() if query in text}
+        assert index.search(query) == linear, query
+
+    build_ms = median_ms(build, 5)
+    linear_ms = median_ms(lambda: [[n for n, t in texts.items() if q in t] for q in QUERIES], 20) / len(QUERIES)
+    lookup_ms = median_ms(lambda: [index.search(q) for q in QUERIES], 20) / len(QUERIES)
+    return build_ms, linear_ms, lookup_ms
+
+
+def bench_first_keystroke(app, count):
+    """CatalogLoader 加载完成后，在“所有工具”中第一次输入搜索词的耗时（Tk 线程）"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / 'config.ini'
+        write_config(config_path, count)
+        loader = app.CatalogLoader(config_path)
+        loader._run()
+        _, tool_manager = loader.results.get()
+
+        def reset(prebuilt):
+            tool_manager._search_cache.clear()
+            tool_manager._last_search = None
+            tool_manager._search_index = None
+            if prebuilt:
+                tool_manager.build_search_index()
+
+        lazy = median_ms(lambda: tool_manager.search_tools("所有工具", "s", "名称"), 5, lambda: reset(False))
+        prebuilt = median_ms(lambda: tool_manager.search_tools("所有工具", "s", "名称"), 5, lambda: reset(True))
+    return lazy, prebuilt
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    app = load_app()
+    print(f"Python {sys.version.split()[0]}，查询: {' '.join(QUERIES)}（每个查询的平均值）")
+    print(f"{'工具数':>6} {'建索引':>10} {'逐个匹配':>10} {'索引查询':>10} {'首次搜索(现建)':>14} {'首次搜索(预建)':>14}")
+    for count in SIZES:
+        build_ms, linear_ms, lookup_ms = bench_index(app, count)
+        lazy, prebuilt = bench_first_keystroke(app, count)
+        print(f"{count:>6} {build_ms:>8.1f}ms {linear_ms:>8.3f}ms {lookup_ms:>8.3f}ms {lazy:>12.1f}ms {prebuilt:>12.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app():
+    """主程序模块（文件名以数字开头，不能直接 import；没有 ttkbootstrap 时跳过）"""
+    pytest.importorskip("ttkbootstrap")
+    spec = importlib.util.spec_from_file_location(
+        "main_theme_dev", Path(__file__).resolve().parent.parent / "4_main_theme_dev.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,20 @@
+def test_pack_count_skips_duplicate_tools(app, tmp_path):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text("[set]\ncolumns = 4\n\n[godzilla]\ncategory = 其他\npath = g.exe\ntype = exe\n", encoding="utf-8")
+    (tmp_path / "conf.d").mkdir()
+    (tmp_path / "conf.d" / "webshell.ini").write_text(
+        "[godzilla]\npath = g.jar\ntype = jar\n\n[behinder]\npath = b.jar\ntype = jar\n", encoding="utf-8"
+    )
+    manager = app.ConfigManager(config_path)
+    assert manager.packs["webshell"].count == 1
+
+    # 清单中的数量与重新启动后一致
+    manager = app.ConfigManager(config_path)
+    assert manager.get_pending_count("webshell") == 1
+    manager.load_category("webshell")
+    assert manager.packs["webshell"].count == 1
+
+    manager.add_tool("antsword", "webshell", "a.exe", "exe")
+    assert manager.packs["webshell"].count == 2
+    manager.remove_tool("behinder")
+    assert manager.packs["webshell"].count == 1
@@ -0,0 +1,44 @@
+CONFIG = """[set]
+columns = 4
+
+[fscan]
+category = 信息收集
+path = tools/fscan.exe
+type = cmd
+description = 第一行
+"""
+
+
+def test_reload_keeps_conf_d_tool_with_same_name(app, tmp_path, caplog):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text(CONFIG, encoding="utf-8")
+    (tmp_path / "conf.d").mkdir()
+    (tmp_path / "conf.d" / "webshell.ini").write_text("[godzilla]\npath = tools/godzilla.jar\ntype = jar\n", encoding="utf-8")
+    manager = app.ConfigManager(config_path)
+    manager.load_category("webshell")
+    pack_tool = manager.get_tool("godzilla")
+    watcher = app.ConfigWatcher(manager)
+
+    config_path.write_text(CONFIG + "\n[godzilla]\ncategory = 其他\npath = other.exe\ntype = exe\n", encoding="utf-8")
+    assert not manager.apply_reload(watcher.check())
+    assert manager.get_tool("godzilla") is pack_tool
+    assert "godzilla" in caplog.text
+
+    config_path.write_text(CONFIG, encoding="utf-8")
+    assert not manager.apply_reload(watcher.check())
+    assert manager.get_tool("godzilla") is pack_tool
+
+
+def test_reload_picks_up_newline_style(app, tmp_path):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text(CONFIG, encoding="utf-8")
+    manager = app.ConfigManager(config_path)
+
+    edited = CONFIG.replace("第一行", "外部修改").replace("\n", "\r\n").encode("utf-8")
+    config_path.write_bytes(edited)
+    manager.apply_reload(app.ConfigWatcher(manager).check())
+    assert manager.get_tool("fscan").description == "外部修改"
+    manager.set_columns(5)
+    manager.flush()
+
+    assert config_path.read_bytes() == edited.replace(b"columns = 4", b"columns = 5")
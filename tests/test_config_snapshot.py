@@ -0,0 +1,55 @@
+CONFIG = """[set]
+columns = 4
+
+[a]
+category = 其他
+path = a.exe
+type = exe
+"""
+
+
+def test_snapshot_is_keyed_on_the_parsed_file(app, tmp_path):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text(CONFIG, encoding="utf-8")
+    manager = app.ConfigManager(config_path)
+
+    with open(config_path, "a", encoding="utf-8") as f:
+        f.write("\n[ext]\ncategory = 其他\npath = ext.exe\ntype = exe\n")
+    manager.add_tool("b", "其他", "b.exe", "exe")
+    manager.flush()
+    manager.save_snapshot()
+
+    assert {"a", "b", "ext"} <= set(app.ConfigManager(config_path).tools)
+
+
+def test_snapshot_skips_unsaved_changes(app, tmp_path):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text(CONFIG, encoding="utf-8")
+    manager = app.ConfigManager(config_path)
+    # 模拟快照还没有写入（如写入失败）
+    manager.snapshot_path.unlink()
+    manager._snapshot_key = None
+
+    manager.set_columns(7)
+    manager.save_snapshot()
+    manager._cancel_flush_timer()
+
+    assert app.ConfigManager(config_path).get_columns() == 4
+
+
+def test_without_parser_internals_parses_normally(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app.CatalogParser, "fast", False)
+    config_path = tmp_path / "config.ini"
+    config_path.write_text(CONFIG, encoding="utf-8")
+    manager = app.ConfigManager(config_path)
+    assert not manager.snapshot_path.exists()
+    assert set(manager.tools) == {"a"}
+
+    # 外部修改与尚未写入的本地修改合并
+    manager.set_columns(7)
+    config_path.write_text(CONFIG + "\n[ext]\ncategory = 其他\npath = ext.exe\ntype = exe\n", encoding="utf-8")
+    reloaded = app.ConfigWatcher(manager).check()
+    changes = manager.apply_reload(reloaded)
+    manager._cancel_flush_timer()
+    assert [tool.name for tool in changes.added] == ["ext"]
+    assert manager.get_columns() == 7
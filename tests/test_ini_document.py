@@ -0,0 +1,72 @@
+import configparser
+
+import pytest
+
+
+CONFIG = """[set]
+columns = 4
+
+[fscan]
+category = 信息收集
+path = tools/fscan.exe
+type = cmd
+description = 第一行
+    [x]
+    more
+
+[other]
+category = 信息收集
+path = tools/other.exe
+type = exe
+"""
+
+
+def test_indented_bracket_line_is_value_continuation(app, tmp_path):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text(CONFIG, encoding="utf-8")
+    manager = app.ConfigManager(config_path)
+    assert manager.get_tool("fscan").description == "第一行\n[x]\nmore"
+
+    manager.add_tool("fscan", "信息收集", "tools/fscan.exe", "cmd", description="新的描述")
+    manager.flush()
+
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read(config_path, encoding="utf-8")
+    assert parser["fscan"]["description"] == "新的描述"
+    assert parser.sections() == ["set", "fscan", "other"]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_untouched_sections_keep_their_bytes(app, tmp_path, newline):
+    config_path = tmp_path / "config.ini"
+    original = CONFIG.replace("\n", newline).encode("utf-8")
+    config_path.write_bytes(original)
+    manager = app.ConfigManager(config_path)
+
+    manager.set_columns(5)
+    manager.flush()
+
+    data = config_path.read_bytes()
+    assert data == original.replace(b"columns = 4", b"columns = 5")
+    assert manager.document.digest == app.hashlib.sha1(data).hexdigest()
+
+
+def test_save_over_external_edit_lets_watcher_reload(app, tmp_path):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text(CONFIG, encoding="utf-8")
+    manager = app.ConfigManager(config_path)
+    watcher = app.ConfigWatcher(manager)
+
+    with open(config_path, "a", encoding="utf-8") as f:
+        f.write("\n[ext]\ncategory = 其他\npath = ext.exe\ntype = exe\n")
+    manager.add_tool("b", "其他", "b.exe", "exe")
+    assert "ext" in config_path.read_text(encoding="utf-8")
+    assert "ext" not in manager.tools
+
+    reloaded = watcher.check()
+    assert reloaded is not None
+    changes = manager.apply_reload(reloaded)
+    assert [tool.name for tool in changes.added] == ["ext"]
+    assert {"fscan", "other", "b", "ext"} <= set(manager.tools)
+    assert watcher.check() is None
+
@@ -0,0 +1,32 @@
+import pytest
+
+
+def test_backend_must_implement_runtime_and_spawn(app):
+    with pytest.raises(TypeError):
+        app.LaunchBackend()
+
+
+@pytest.mark.parametrize("terminal, exec_args", [
+    ("/usr/bin/gnome-terminal", ["--"]),
+    ("kitty", []),
+    ("/opt/bin/my-term", ["-e"]),
+])
+def test_terminal_from_environment_uses_its_exec_args(app, monkeypatch, terminal, exec_args):
+    monkeypatch.setenv("TERMINAL", terminal)
+    monkeypatch.setattr(app.shutil, "which", lambda name: name if name == terminal else None)
+    assert app.LinuxBackend()._detect_terminal() == [terminal] + exec_args
+
+
+def test_malformed_args_report_error_with_tool_and_args(app, tmp_path):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text("[set]\ncolumns = 4\n", encoding="utf-8")
+    manager = app.EnvironmentManager(app.ConfigManager(config_path), app.LinuxBackend())
+    manager.current_dir = tmp_path
+    (tmp_path / "fscan").write_text("", encoding="utf-8")
+
+    launch = manager.run_with_environment(app.Tool("fscan", "扫描", "fscan", "exe", args='-h "unclosed'))
+    assert launch["outcome"] == "error"
+    assert "fscan" in launch["error"] and repr('-h "unclosed') in launch["error"]
+
+    launch = manager.run_with_environment(app.Tool("fscan", "扫描", "fscan", "unknown"))
+    assert launch["outcome"] == "unsupported"
@@ -0,0 +1,31 @@
+def launch(pid):
+    return {'type': 'exe', 'env': '', 'argv': ['fscan'], 'cwd': '.', 'latency_ms': 1.0, 'pid': pid, 'outcome': 'started'}
+
+
+def test_two_writers_do_not_duplicate_index_lines(app, tmp_path):
+    path = tmp_path / "launches.jsonl"
+    first = app.LaunchLog(path)
+    second = app.LaunchLog(path)
+
+    first.record("fscan", launch(1))
+    assert len(first.recent("fscan")) == 1
+    second.record("fscan", launch(2))
+    second.record("other", launch(3))
+    first.record("fscan", launch(4))
+
+    assert [r['pid'] for r in first.recent("fscan")] == [4, 2, 1]
+    assert [r['pid'] for r in second.recent("fscan")] == [4, 2, 1]
+    lines = path.with_suffix(".idx").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(set(lines)) == 4
+    assert [r['pid'] for r in app.LaunchLog(path).recent("fscan")] == [4, 2, 1]
+
+
+def test_duplicate_index_lines_are_ignored(app, tmp_path):
+    path = tmp_path / "launches.jsonl"
+    log = app.LaunchLog(path)
+    log.record("fscan", launch(1))
+    log.record("fscan", launch(2))
+    index = path.with_suffix(".idx")
+    index.write_text(index.read_text(encoding="utf-8") * 2, encoding="utf-8")
+
+    assert [r['pid'] for r in app.LaunchLog(path).recent("fscan")] == [2, 1]
@@ -0,0 +1,30 @@
+import logging
+
+import pytest
+
+
+@pytest.mark.parametrize("text, level, message", [
+    ("2025-04-02 15:41:22,123 - INFO - 启动工具 fscan", "INFO", "启动工具 fscan"),
+    ("2025-04-02 15:41:22 - __main__ - ERROR - main2.run_with_environment:183 - 工具 fscan 启动失败",
+     "ERROR", "工具 fscan 启动失败"),
+    ("2025-04-02 15:41:22 [WARNING] 磁盘空间不足", "WARNING", "磁盘空间不足"),
+])
+def test_known_formats(app, text, level, message):
+    entry = app.LogEntry.parse(0, text)
+    assert (entry.level, entry.message) == (level, message)
+    assert entry.levelno == logging.getLevelName(level)
+
+
+def test_only_lines_without_timestamp_continue_previous_record(app):
+    first = app.LogEntry.parse(0, "2025-04-02 15:41:22,123 - ERROR - 工具 fscan 启动失败")
+    trace = app.LogEntry.parse(1, "Traceback (most recent call last):", first)
+    other = app.LogEntry.parse(2, "2025-04-02 15:41:23 something else", trace)
+    assert (trace.level, trace.tool) == ("ERROR", "fscan")
+    assert (other.timestamp, other.level, other.levelno) == ("2025-04-02 15:41:23", "", 0)
+
+
+def test_unknown_level_is_level_zero(app):
+    entry = app.LogEntry.parse(0, "2025-04-02 15:41:22,123 - TRACE - 细节")
+    assert entry.levelno == 0
+    assert entry.matches(logging.INFO) is False
+    assert entry.matches() is True